@@ -0,0 +1,199 @@
+"""
+레이더 차트 렌더러 벤치마크
+
+기존 pyplot 구현(legacy)과 템플릿 기반 렌더러(fast)의 차트 1장당 지연 시간, 최대 RSS,
+그리고 두 결과 PNG의 픽셀 차이를 비교합니다. 각 구현은 별도 프로세스에서 측정합니다.
+
+    python benchmarks/bench_chart.py            # 두 구현 비교
+    python benchmarks/bench_chart.py --impl fast --iterations 500
+"""
+import argparse
+import base64
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+SAMPLE_SCORES = [
+    dict(wrinkles=85, pores=40, pigmentation=70, acne=95, redness=60, elasticity=50, hydration=45),
+    dict(wrinkles=100, pores=5, pigmentation=100, acne=9, redness=100, elasticity=100, hydration=7),
+    dict(wrinkles=12, pores=33, pigmentation=57, acne=71, redness=20, elasticity=88, hydration=64),
+]
+
+def comparison_samples(count: int = 20) -> list[dict]:
+    """픽셀 비교용 점수 (고정 샘플 + 시드 고정 무작위 샘플)"""
+    import random
+    rng = random.Random(0)
+    fields = list(SAMPLE_SCORES[0])
+    return SAMPLE_SCORES + [{f: rng.randint(0, 100) for f in fields} for _ in range(count)]
+
+def legacy_create_radar_chart(scores) -> str:
+    """변경 전 services/chart.py의 pyplot 구현 (비교 기준)"""
+    import numpy as np
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import matplotlib.font_manager as fm
+
+    font_path = os.path.join(ROOT_DIR, "fonts", "NanumGothic-Bold.ttf")
+    try:
+        font_prop = fm.FontProperties(fname=font_path)
+    except Exception:
+        font_prop = fm.FontProperties(family='Apple SD Gothic Neo')
+
+    plt.rcParams['axes.unicode_minus'] = False
+
+    labels = [
+        f'주름\n({scores.wrinkles})',
+        f'모공\n({scores.pores})',
+        f'색소\n({scores.pigmentation})',
+        f'트러블\n({scores.acne})',
+        f'붉은기\n({scores.redness})',
+        f'탄력\n({scores.elasticity})',
+        f'수분\n({scores.hydration})'
+    ]
+    values = [
+        scores.wrinkles, scores.pores, scores.pigmentation,
+        scores.acne, scores.redness, scores.elasticity,
+        scores.hydration
+    ]
+
+    values += values[:1]
+    angles = np.linspace(0, 2 * np.pi, len(labels), endpoint=False).tolist()
+    angles += angles[:1]
+
+    fig = plt.figure(figsize=(8, 8))
+    ax = fig.add_subplot(111, polar=True)
+
+    ax.fill_between(angles, 0, 40, color='#FFDDDD', alpha=0.5)
+    ax.fill_between(angles, 40, 70, color='#FFFEDD', alpha=0.5)
+    ax.fill_between(angles, 70, 100, color='#DDFFDD', alpha=0.5)
+
+    ax.plot(angles, values, color='#FF007F', linewidth=2, linestyle='solid', label='내 피부 점수')
+    ax.fill(angles, values, color='#FF007F', alpha=0.2)
+
+    ax.set_theta_offset(np.pi / 2)
+    ax.set_theta_direction(-1)
+
+    ax.set_xticks(angles[:-1])
+    ax.set_xticklabels(labels, fontproperties=font_prop, size=11, weight='bold')
+
+    for label in ax.get_xticklabels():
+        label.set_color('#333333')
+
+    ax.set_rlabel_position(0)
+    plt.yticks([20, 40, 60, 80, 100], ["20", "40", "60", "80", "100"], color="grey", size=8)
+    plt.ylim(0, 100)
+
+    ax.spines['polar'].set_visible(False)
+    ax.grid(True, color='grey', linestyle='--', alpha=0.5)
+
+    plt.figtext(0.5, 0.95, "바깥쪽으로 넓을수록 피부 상태가 좋습니다.", ha='center',
+                fontproperties=font_prop, size=13, weight='bold', color='#000000')
+
+    ax.text(0, 0, "Bad", ha='center', va='center', color='red', weight='bold', size=10, alpha=0.7)
+    ax.text(np.radians(45), 110, "Good", ha='center', va='center', color='green', weight='bold', size=10)
+
+    buf = io.BytesIO()
+    plt.savefig(buf, format='png', bbox_inches='tight', transparent=True)
+    plt.close(fig)
+    buf.seek(0)
+
+    return base64.b64encode(buf.read()).decode('utf-8')
+
+def _max_rss_mb() -> float:
+    # Linux에서 ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run_impl(impl: str, iterations: int) -> dict:
+    """한 구현을 현재 프로세스에서 측정합니다."""
+    from schemas import SkinScores
+
+    if impl == "legacy":
+        render = legacy_create_radar_chart
+    else:
+        from services.chart import create_radar_chart as render
+
+    samples = [SkinScores(**s) for s in SAMPLE_SCORES]
+
+    started = time.perf_counter()
+    render(samples[0])  # 첫 호출(폰트/템플릿 로딩) 비용은 따로 기록
+    first_ms = (time.perf_counter() - started) * 1000
+
+    timings = []
+    for i in range(iterations):
+        t = time.perf_counter()
+        render(samples[i % len(samples)])
+        timings.append((time.perf_counter() - t) * 1000)
+    timings.sort()
+
+    return {
+        "impl": impl,
+        "iterations": iterations,
+        "first_call_ms": round(first_ms, 2),
+        "mean_ms": round(sum(timings) / len(timings), 3),
+        "p50_ms": round(timings[len(timings) // 2], 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+        "max_rss_mb": round(_max_rss_mb(), 1),
+        "outputs": [render(SkinScores(**s)) for s in comparison_samples()],
+    }
+
+def compare_outputs(legacy: list[str], fast: list[str]) -> list[dict]:
+    """두 구현의 PNG를 픽셀 단위로 비교합니다."""
+    import numpy as np
+    from PIL import Image
+
+    report = []
+    for a, b in zip(legacy, fast):
+        img_a = np.asarray(Image.open(io.BytesIO(base64.b64decode(a))).convert("RGBA")).astype(int)
+        img_b = np.asarray(Image.open(io.BytesIO(base64.b64decode(b))).convert("RGBA")).astype(int)
+        entry = {"legacy_size": img_a.shape[1::-1], "fast_size": img_b.shape[1::-1]}
+        if img_a.shape == img_b.shape:
+            diff = np.abs(img_a - img_b)
+            entry.update({
+                "identical": bool((diff == 0).all()),
+                "max_abs_diff": int(diff.max()),
+                "mean_abs_diff": round(float(diff.mean()), 4),
+                "differing_pixels": int((diff.max(axis=2) > 0).sum()),
+            })
+        report.append(entry)
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--impl", choices=["legacy", "fast"], help="한 구현만 측정 (내부 실행용)")
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    if args.impl:
+        print(json.dumps(run_impl(args.impl, args.iterations)))
+        return
+
+    results = {}
+    for impl in ("legacy", "fast"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--impl", impl, "--iterations", str(args.iterations)],
+            check=True, capture_output=True, text=True,
+        )
+        results[impl] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    print(f"{'impl':<8}{'first(ms)':>12}{'mean(ms)':>12}{'p50(ms)':>12}{'p95(ms)':>12}{'maxRSS(MB)':>12}")
+    for impl, r in results.items():
+        print(f"{impl:<8}{r['first_call_ms']:>12}{r['mean_ms']:>12}{r['p50_ms']:>12}{r['p95_ms']:>12}{r['max_rss_mb']:>12}")
+    print(f"speedup (mean): x{results['legacy']['mean_ms'] / results['fast']['mean_ms']:.1f}")
+
+    report = compare_outputs(results["legacy"]["outputs"], results["fast"]["outputs"])
+    identical = sum(1 for entry in report if entry.get("identical"))
+    print(f"\n픽셀 비교 (legacy vs fast): {identical}/{len(report)} 동일")
+    for entry in report:
+        if not entry.get("identical"):
+            print(f"  {entry}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+제품 카드 추출 벤치마크
+
+저장된 올리브영 검색 결과 스냅샷(fixtures/oliveyoung_search.html)으로 측정합니다.
+
+- 기본: html.parser 기반 오프라인 파서(parse_products_html)의 페이지당 파싱 시간
+- --browser: Chromium에 스냅샷을 띄워 기존 필드별 locator 추출과 단일 evaluate 추출의 시간/결과를 비교
+  (playwright install chromium 필요)
+
+    python benchmarks/bench_product_parser.py
+    python benchmarks/bench_product_parser.py --browser --iterations 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from services.product_parser import EXTRACT_PRODUCTS_JS, normalize_product, parse_products_html
+
+FIXTURE_PATH = os.path.join(ROOT_DIR, "benchmarks", "fixtures", "oliveyoung_search.html")
+
+async def legacy_extract(page, limit: int) -> list[dict]:
+    """변경 전 crawler.py의 필드별 locator 추출 (비교 기준)"""
+    products = []
+    product_locators = page.locator(".prd_info")
+    count = await product_locators.count()
+    for i in range(min(count, limit)):
+        prd = product_locators.nth(i)
+
+        brand_locator = prd.locator(".tx_brand")
+        brand = await brand_locator.text_content() if await brand_locator.count() > 0 else "브랜드 없음"
+        name_locator = prd.locator(".tx_name")
+        name = await name_locator.text_content() if await name_locator.count() > 0 else "제품명 없음"
+
+        img_locator = prd.locator(".prd_thumb > img")
+        src = data_original = None
+        if await img_locator.count() > 0:
+            src = await img_locator.get_attribute("src")
+            data_original = await img_locator.get_attribute("data-original")
+
+        link_locator = prd.locator("a.prd_thumb")
+        href = await link_locator.get_attribute("href") if await link_locator.count() > 0 else None
+
+        products.append(normalize_product(
+            {"brand": brand, "name": name, "src": src, "data_original": data_original, "href": href}
+        ))
+    return products
+
+async def evaluate_extract(page, limit: int) -> list[dict]:
+    return [normalize_product(raw) for raw in await page.evaluate(EXTRACT_PRODUCTS_JS, limit)]
+
+def bench_offline(html: str, limit: int, iterations: int) -> None:
+    expected = len(parse_products_html(html, limit))
+    for label, n in ((f"top {limit}", limit), ("전체 카드", 10_000)):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            parse_products_html(html, n)
+        ms = (time.perf_counter() - started) / iterations * 1000
+        print(f"  parse_products_html ({label}): {ms:.3f} ms/page")
+    print(f"  추출 제품 수: {expected}")
+
+async def bench_browser(html: str, limit: int, iterations: int) -> None:
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.set_content(html)
+
+        offline = parse_products_html(html, limit)
+        for label, extract in (("locator (legacy)", legacy_extract), ("evaluate", evaluate_extract)):
+            result = await extract(page, limit)
+            started = time.perf_counter()
+            for _ in range(iterations):
+                await extract(page, limit)
+            ms = (time.perf_counter() - started) / iterations * 1000
+            print(f"  {label:<18}: {ms:8.3f} ms/page  (오프라인 파서와 동일: {result == offline})")
+        await browser.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=3, help="추출할 상위 카드 수")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--browser", action="store_true", help="Chromium에서 locator/evaluate 추출도 비교")
+    args = parser.parse_args()
+
+    with open(FIXTURE_PATH, encoding="utf-8") as f:
+        html = f.read()
+    print(f"스냅샷: {os.path.relpath(FIXTURE_PATH, ROOT_DIR)} ({len(html):,} bytes)")
+
+    print("오프라인 파서")
+    bench_offline(html, args.limit, args.iterations)
+
+    if args.browser:
+        print("브라우저 추출")
+        asyncio.run(bench_browser(html, args.limit, args.iterations))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+성분 추천 벤치마크
+
+요청마다 ingredients.json을 다시 읽고 모든 성분을 순회하던 기존 구현(legacy)과
+한 번 읽어 색인해 둔 카탈로그(indexed)의 호출 1회당 지연 시간을 카탈로그 크기별로 비교합니다.
+결과가 기존 구현과 같은지도 함께 확인합니다.
+batch 열은 NumPy 배치 추천(recommend_batch)으로 여러 프로필을 한 번에 계산했을 때의 프로필당 시간입니다.
+
+    python benchmarks/bench_recommendation.py
+    python benchmarks/bench_recommendation.py --scales 1 10 100 1000 --iterations 500
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from ingredient_recommendation import INGREDIENTS_FILE_PATH, SCORE_KEYS, IngredientCatalog, concern_to_korean
+from schemas import IngredientRecommendation, SkinScores
+
+CONCERNS = ["wrinkles", "pores", "pigmentation", "acne", "redness", "elasticity", "hydration"]
+
+def legacy_get_ingredient_recommendations(path: str, scores, priorities: list[str]) -> list[IngredientRecommendation]:
+    """변경 전 구현 (매 호출마다 파일을 읽고 전체 성분을 순회)"""
+    with open(path, "r", encoding="utf-8") as f:
+        all_ingredients = json.load(f)
+
+    is_sensitive = (scores.redness < 50) or (scores.acne < 40)
+
+    scored_ingredients = []
+    top_3_concerns = priorities[:3]
+
+    for ing in all_ingredients:
+        final_score = ing.get("match_score", 0)
+        matched_concerns = []
+
+        for idx, concern in enumerate(top_3_concerns):
+            if concern in ing.get("target_concerns", []):
+                matched_concerns.append(concern)
+                if idx == 0:
+                    final_score += 20
+                elif idx == 1:
+                    final_score += 10
+                elif idx == 2:
+                    final_score += 5
+
+        if len(matched_concerns) >= 2:
+            final_score += 15
+
+        sensitivity_risk = ing.get("sensitivity_risk", "Low")
+        if is_sensitive:
+            if sensitivity_risk == "High":
+                final_score -= 100
+            elif sensitivity_risk == "Medium":
+                final_score -= 20
+
+        if len(matched_concerns) > 0:
+            korean_concerns = [concern_to_korean(c) for c in matched_concerns]
+            reason = f"{', '.join(korean_concerns)} 케어를 위해 추천"
+        else:
+            reason = "전반적인 피부 컨디션 개선을 위해 추천"
+
+        scored_ingredients.append({"ingredient": ing, "score": final_score, "reason": reason})
+
+    scored_ingredients.sort(key=lambda x: x["score"], reverse=True)
+
+    recommendations = []
+    recommended_ids = set()
+    for item in scored_ingredients:
+        if len(recommendations) >= 3:
+            break
+        ing = item["ingredient"]
+        if ing["id"] in recommended_ids:
+            continue
+        if item["score"] < 0:
+            continue
+        recommendations.append(IngredientRecommendation(
+            name_ko=ing["name_ko"],
+            name_en=ing["name_en"],
+            efficacy=ing["efficacy"],
+            caution=ing["caution"],
+            match_reason=item["reason"],
+            usage_time=ing.get("usage_time", "ANY")
+        ))
+        recommended_ids.add(ing["id"])
+    return recommendations
+
+def make_catalog(scale: int, rng: random.Random) -> list[dict]:
+    """실제 성분 데이터를 scale배로 늘린 합성 카탈로그 (고민/점수/민감도를 무작위로 변형)"""
+    with open(INGREDIENTS_FILE_PATH, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    if scale == 1:
+        return base
+
+    records = []
+    for i in range(scale):
+        for ing in base:
+            record = dict(ing)
+            record["id"] = f"{ing['id']}_{i}"
+            record["name_ko"] = f"{ing['name_ko']}{i}"
+            record["target_concerns"] = rng.sample(CONCERNS, rng.randint(1, 4))
+            record["match_score"] = rng.randint(50, 100)
+            record["sensitivity_risk"] = rng.choice(["Low", "Medium", "High"])
+            records.append(record)
+    return records
+
+def make_profiles(count: int, rng: random.Random) -> list[tuple[SkinScores, list[str]]]:
+    profiles = []
+    for _ in range(count):
+        scores = SkinScores(**{c: rng.randint(0, 100) for c in CONCERNS})
+        priorities = sorted(CONCERNS, key=lambda c: getattr(scores, c))
+        profiles.append((scores, priorities))
+    return profiles
+
+def bench(fn, profiles, iterations: int) -> float:
+    started = time.perf_counter()
+    for i in range(iterations):
+        scores, priorities = profiles[i % len(profiles)]
+        fn(scores, priorities)
+    return (time.perf_counter() - started) / iterations * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    profiles = make_profiles(200, rng)
+
+    score_matrix = [[getattr(s, key) for key in SCORE_KEYS] for s, _ in profiles]
+
+    print(f"{'scale':>6}{'성분 수':>8}{'legacy(ms)':>14}{'indexed(ms)':>14}{'batch(ms)':>12}{'speedup':>10}{'동일 결과':>10}")
+    for scale in args.scales:
+        records = make_catalog(scale, rng)
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False)
+            path = f.name
+        try:
+            catalog = IngredientCatalog(records)
+            legacy = lambda s, p: legacy_get_ingredient_recommendations(path, s, p)
+
+            started = time.perf_counter()
+            batch_results = catalog.recommend_batch(score_matrix, [p for _, p in profiles])
+            batch_ms = (time.perf_counter() - started) / len(profiles) * 1000
+
+            dump = lambda recs: [r.model_dump() for r in recs]
+            same = all(
+                dump(legacy(s, p)) == dump(catalog.recommend(s, p)) == dump(batch)
+                for (s, p), batch in zip(profiles, batch_results)
+            )
+            legacy_ms = bench(legacy, profiles, max(args.iterations // scale, 5))
+            indexed_ms = bench(catalog.recommend, profiles, args.iterations)
+            print(f"{scale:>6}{len(records):>8}{legacy_ms:>14.3f}{indexed_ms:>14.3f}{batch_ms:>12.3f}{legacy_ms / indexed_ms:>9.0f}x{str(same):>10}")
+        finally:
+            os.remove(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+/skin/diagnosis 응답 직렬화 / 전송량 벤치마크
+
+대표 응답(추천 성분 + 제품 정보 + 차트)을 만들어 다음을 비교합니다.
+
+- 직렬화 시간: 기본 JSONResponse(표준 json) / ORJSONResponse / multipart(차트 원본)
+- 전송 바이트: 압축 없음 / gzip / br(brotli 설치 시)과 압축 시간
+
+    python benchmarks/bench_serialization.py
+    python benchmarks/bench_serialization.py --format svg --iterations 500
+"""
+import argparse
+import gzip
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("CORS_ORIGINS", "*")
+os.environ.setdefault("APP_BASE_URL", "http://127.0.0.1:8000")
+
+from fastapi.responses import JSONResponse
+from benchmarks.fakes import CANNED_RESULT
+from config import settings
+from ingredient_recommendation import get_ingredient_recommendations
+from schemas import AnalysisResponse, Product, SkinScores
+from services.chart import render_chart
+from services.compression import brotli
+from services.serialization import MultipartAnalysisResponse, SkinJSONResponse
+
+def build_sample_response(chart_format: str) -> AnalysisResponse:
+    scores = SkinScores(**CANNED_RESULT["scores"])
+    recommended = get_ingredient_recommendations(scores, CANNED_RESULT["priorities"])
+    for ing in recommended:
+        ing.products = [
+            Product(
+                brand="브랜드",
+                name=f"{ing.name_ko} 세럼 {i}",
+                image=f"https://image.oliveyoung.co.kr/uploads/images/goods/{i}.jpg",
+                link=f"https://www.oliveyoung.co.kr/store/goods/getGoodsDetail.do?goodsNo=A0000{i}",
+            )
+            for i in range(3)
+        ]
+    return AnalysisResponse(
+        is_skin=True,
+        diagnosis=CANNED_RESULT["diagnosis"],
+        recommendation=CANNED_RESULT["recommendation"],
+        scores=scores,
+        priorities=CANNED_RESULT["priorities"],
+        recommended_ingredients=recommended,
+        graph_image=render_chart(scores, chart_format),
+        graph_format=chart_format,
+    )
+
+def time_ms(fn, iterations: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=["png", "svg"], default="png", help="차트 형식")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    response = build_sample_response(args.format)
+
+    # FastAPI는 response_model로 dict를 만든 뒤 response class가 바이트로 인코딩함
+    serializers = {
+        "JSONResponse (기존)": lambda: JSONResponse(response.model_dump(mode="json")).body,
+        f"{SkinJSONResponse.__name__}": lambda: SkinJSONResponse(response.model_dump(mode="json")).body,
+        "multipart (차트 원본)": lambda: MultipartAnalysisResponse(response).body,
+    }
+    print(f"직렬화 시간 ({args.format} 차트, {args.iterations}회 평균)")
+    bodies = {}
+    for label, fn in serializers.items():
+        bodies[label] = fn()
+        print(f"  {label:<24} {time_ms(fn, args.iterations):8.3f} ms  {len(bodies[label]):>9,} bytes")
+
+    json_body = bodies[SkinJSONResponse.__name__]
+    compressors = {
+        f"gzip (level {settings.GZIP_LEVEL})": lambda: gzip.compress(json_body, compresslevel=settings.GZIP_LEVEL),
+    }
+    if brotli is not None:
+        compressors[f"br (quality {settings.BROTLI_QUALITY})"] = lambda: brotli.compress(json_body, quality=settings.BROTLI_QUALITY)
+
+    print("JSON 본문 압축")
+    print(f"  {'압축 없음':<24} {0:8.3f} ms  {len(json_body):>9,} bytes")
+    for label, fn in compressors.items():
+        size = len(fn())
+        print(f"  {label:<24} {time_ms(fn, args.iterations):8.3f} ms  {size:>9,} bytes ({size / len(json_body):.0%})")
+    if brotli is None:
+        print("  (brotli 패키지가 없어 br은 건너뜀)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+서버 시작 시간 벤치마크
+
+- import: `python -X importtime -c "import main"`으로 main.py를 불러오는 시간과 오래 걸린 모듈
+- 부팅: uvicorn(benchmarks.fake_app)을 띄워 첫 GET / 200 응답까지의 시간(time-to-first-200),
+        GET /startup 보고서(단계별 시간, 지연 로딩한 모듈), 첫 /skin/diagnosis 응답 시간
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --no-warmup      # 예열 없이 첫 진단 요청이 import 비용을 내는 경우
+    python benchmarks/bench_startup.py --runs 5 --output startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.fakes import make_jpeg
+from benchmarks.run_benchmarks import _free_port
+
+ENV_DEFAULTS = {"GEMINI_API_KEY": "benchmark", "CORS_ORIGINS": "*", "APP_BASE_URL": "http://127.0.0.1:8000"}
+
+def measure_imports(top: int) -> dict:
+    """main.py import 시간과 누적 시간이 긴 모듈 (main 기준 2단계 깊이까지)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT_DIR, env={**ENV_DEFAULTS, **os.environ}, capture_output=True, text=True, check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((name.strip(), depth, int(cumulative) / 1000))
+
+    main_ms = next(ms for name, depth, ms in modules if name == "main")
+    heavy = sorted((m for m in modules if 1 <= m[1] <= 2), key=lambda m: -m[2])[:top]
+    return {"main_ms": round(main_ms, 1), "slowest": {name: round(ms, 1) for name, _, ms in heavy}}
+
+def measure_boot(warmup: bool, diagnosis: bool) -> dict:
+    import httpx
+
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **ENV_DEFAULTS,
+            **os.environ,
+            "STARTUP_WARMUP": str(warmup).lower(),
+            "FAKE_GEMINI_LATENCY": "0",
+            # 크롤링이 외부로 나가지 않도록 닫힌 포트를 지정
+            "OLIVEYOUNG_BASE_URL": "http://127.0.0.1:9",
+            "CACHE_DB_PATH": os.path.join(tmp, "bench.sqlite3"),
+            "APP_BASE_URL": f"http://127.0.0.1:{port}",
+        }
+        started = time.perf_counter()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "benchmarks.fake_app:app",
+             "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+            cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=60) as client:
+                while True:
+                    if server.poll() is not None:
+                        raise RuntimeError("앱 서버가 종료되었습니다.")
+                    try:
+                        if client.get("/").status_code == 200:
+                            break
+                    except httpx.TransportError:
+                        pass
+                    time.sleep(0.01)
+                first_200 = time.perf_counter() - started
+
+                first_diagnosis = None
+                if diagnosis:
+                    if warmup:
+                        # 예열이 끝난 뒤 요청 (첫 요청 후 백그라운드에서 진행됨)
+                        deadline = time.monotonic() + 30
+                        while "warmup_done" not in client.get("/startup").json()["phases"] and time.monotonic() < deadline:
+                            time.sleep(0.05)
+                    request_started = time.perf_counter()
+                    response = client.post("/skin/diagnosis", files={"image": ("a.jpg", make_jpeg(0), "image/jpeg")})
+                    response.raise_for_status()
+                    first_diagnosis = time.perf_counter() - request_started
+
+                report = client.get("/startup").json()
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    return {
+        "warmup": warmup,
+        "time_to_first_200_s": round(first_200, 3),
+        "first_diagnosis_s": round(first_diagnosis, 3) if first_diagnosis is not None else None,
+        "phases": report["phases"],
+        "lazy_imports": report["lazy_imports"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="부팅 측정 반복 횟수 (중앙값 출력)")
+    parser.add_argument("--top", type=int, default=10, help="출력할 느린 모듈 수")
+    parser.add_argument("--no-warmup", action="store_true", help="STARTUP_WARMUP=false로 실행")
+    parser.add_argument("--skip-diagnosis", action="store_true", help="첫 진단 요청 시간은 측정하지 않음")
+    parser.add_argument("--output", help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    imports = measure_imports(args.top)
+    print(f"import main: {imports['main_ms']} ms")
+    for name, ms in imports["slowest"].items():
+        print(f"  {name:<40} {ms:8.1f} ms")
+
+    boots = [measure_boot(not args.no_warmup, not args.skip_diagnosis) for _ in range(args.runs)]
+    boots.sort(key=lambda b: b["time_to_first_200_s"])
+    median = boots[len(boots) // 2]
+    print(f"부팅 (예열 {'사용' if median['warmup'] else '안 함'}, {args.runs}회 중앙값)")
+    print(f"  time-to-first-200 (/): {median['time_to_first_200_s']} s  (전체: {[b['time_to_first_200_s'] for b in boots]})")
+    if median["first_diagnosis_s"] is not None:
+        print(f"  첫 /skin/diagnosis: {median['first_diagnosis_s']} s")
+    for phase, seconds in median["phases"].items():
+        print(f"  {phase:<20} {seconds:8.3f} s")
+    for name, info in median["lazy_imports"].items():
+        print(f"  lazy import {name:<28} {info['seconds'] * 1000:8.1f} ms ({info['thread']})")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"imports": imports, "boots": boots}, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""
+부하 테스트용 앱 진입점: main.app과 같지만 Gemini 호출을 가짜 클라이언트로 바꿉니다.
+
+    FAKE_GEMINI_LATENCY=1.0 OLIVEYOUNG_BASE_URL=http://127.0.0.1:8765 \\
+        uvicorn benchmarks.fake_app:app --port 8000
+
+환경 변수
+- FAKE_GEMINI_LATENCY / FAKE_GEMINI_JITTER: 가짜 응답 지연(초)과 ± 흔들림
+- FAKE_GEMINI_RESULT: 반환할 GeminiAnalysisResult JSON 파일 (생략 시 fakes.CANNED_RESULT)
+"""
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# 필수 설정값이 없어도 실행되도록 기본값 지정
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("CORS_ORIGINS", "*")
+os.environ.setdefault("APP_BASE_URL", "http://127.0.0.1:8000")
+
+from benchmarks.fakes import install_fake_gemini
+
+install_fake_gemini(
+    latency=float(os.environ.get("FAKE_GEMINI_LATENCY", "1.0")),
+    jitter=float(os.environ.get("FAKE_GEMINI_JITTER", "0.0")),
+    result_path=os.environ.get("FAKE_GEMINI_RESULT"),
+)
+
+from main import app  # noqa: E402
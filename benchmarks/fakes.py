@@ -0,0 +1,137 @@
+"""
+벤치마크용 외부 서비스 대역
+
+- FakeGenaiClient: genai.Client 대신 설정한 지연 후 미리 준비한 GeminiAnalysisResult를 반환
+- FixtureServer: 올리브영 검색 페이지 대신 저장된 HTML 스냅샷을 돌려주는 로컬 HTTP 서버
+- make_jpeg: 업로드용 테스트 이미지 생성
+"""
+import asyncio
+import io
+import json
+import os
+import random
+import threading
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_PATH = os.path.join(ROOT_DIR, "benchmarks", "fixtures", "oliveyoung_search.html")
+
+CANNED_RESULT = {
+    "is_skin": True,
+    "scores": {
+        "wrinkles": 85, "pores": 40, "pigmentation": 70, "acne": 95,
+        "redness": 60, "elasticity": 50, "hydration": 45,
+    },
+    "total_score": 67,
+    "priorities": ["pores", "hydration", "elasticity", "redness", "pigmentation", "wrinkles", "acne"],
+    "diagnosis": "전반적으로 깨끗하지만 모공 늘어짐과 속건조가 가장 시급한 문제입니다.",
+    "recommendation": "수분을 충분히 공급하고 탄력 관리가 필요합니다.",
+}
+
+class _FakeModels:
+    def __init__(self, latency: float, jitter: float, result: dict):
+        from schemas import GeminiAnalysisResult
+
+        self.latency = latency
+        self.jitter = jitter
+        self.parsed = GeminiAnalysisResult.model_validate(result)
+        self.calls = 0
+
+    def _parse(self, contents: list, response_schema):
+        from schemas import GeminiMultiAnalysisResult
+
+        if response_schema is not GeminiMultiAnalysisResult:
+            return self.parsed.model_copy(deep=True)
+        # 여러 장 진단: "[사진: 부위]" 표시마다 같은 점수를 돌려줌
+        regions = [part[len("[사진: "):-1] for part in contents if isinstance(part, str) and part.startswith("[사진: ")]
+        return GeminiMultiAnalysisResult(
+            regions=[{"region": region, "is_skin": self.parsed.is_skin, "scores": self.parsed.scores} for region in regions],
+            diagnosis=self.parsed.diagnosis,
+            recommendation=self.parsed.recommendation,
+        )
+
+    async def generate_content(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+        images = sum(1 for part in kwargs["contents"] if not isinstance(part, str))
+        # 이미지 한 장당 약 258 토큰 + 프롬프트 약 1030 토큰
+        prompt_tokens = 1030 + 258 * images
+        usage = types.SimpleNamespace(
+            prompt_token_count=prompt_tokens, candidates_token_count=160, total_token_count=prompt_tokens + 160
+        )
+        return types.SimpleNamespace(parsed=self._parse(kwargs["contents"], kwargs["config"]["response_schema"]), usage_metadata=usage)
+
+class FakeGenaiClient:
+    """client.aio.models.generate_content만 흉내 냅니다."""
+
+    def __init__(self, latency: float = 1.0, jitter: float = 0.0, result: dict | None = None):
+        self.aio = types.SimpleNamespace(models=_FakeModels(latency, jitter, result or CANNED_RESULT))
+
+def install_fake_gemini(latency: float = 1.0, jitter: float = 0.0, result_path: str | None = None) -> FakeGenaiClient:
+    """services.analysis의 Gemini 클라이언트를 가짜로 교체합니다."""
+    import services.analysis as analysis
+
+    result = None
+    if result_path:
+        with open(result_path, encoding="utf-8") as f:
+            result = json.load(f)
+    fake = FakeGenaiClient(latency, jitter, result)
+    analysis.client = fake
+    return fake
+
+class FixtureServer:
+    """모든 GET 요청에 검색 결과 스냅샷을 돌려주는 로컬 서버 (백그라운드 스레드에서 실행)"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, path: str = FIXTURE_PATH, latency: float = 0.0):
+        with open(path, "rb") as f:
+            body = f.read()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if latency:
+                    threading.Event().wait(latency)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+def make_jpeg(seed: int = 0, size: tuple[int, int] = (1600, 1200)) -> bytes:
+    """
+    seed마다 내용이 다른 피부색 JPEG (결과 캐시에 걸리지 않도록)
+    피부 사진 사전 판별(services.prescreen)을 통과하도록 잡음으로 질감을 넣음
+    """
+    from PIL import Image
+
+    rng = random.Random(seed)
+    img = Image.new("RGB", size, (rng.randint(170, 230), rng.randint(120, 170), rng.randint(95, 135)))
+    # 작게 만든 잡음을 키워 피부 결처럼 완만한 명암을 만듦
+    noise = Image.effect_noise((size[0] // 40, size[1] // 40), 60).resize(size, Image.Resampling.BICUBIC)
+    img = Image.blend(img, noise.convert("RGB"), 0.15)
+    # 작은 잡음 블록을 찍어 이미지마다 바이트가 달라지게 함
+    for _ in range(20):
+        x, y = rng.randrange(size[0] - 8), rng.randrange(size[1] - 8)
+        img.paste((rng.randrange(256), rng.randrange(256), rng.randrange(256)), (x, y, x + 8, y + 8))
+    buf = io.BytesIO()
+    img.save(buf, "JPEG", quality=90)
+    return buf.getvalue()
@@ -0,0 +1,250 @@
+"""
+벤치마크 / 부하 테스트 실행기
+
+외부 서비스 없이 재현 가능하도록 Gemini는 가짜 클라이언트(fakes.FakeGenaiClient),
+올리브영은 로컬 fixture 서버(fakes.FixtureServer)로 대체합니다.
+
+- micro: create_radar_chart(png) / render_chart(svg) / get_ingredient_recommendations / parse_products_html
+- load: uvicorn으로 띄운 앱(benchmarks/fake_app.py)에 /skin/diagnosis 요청을 동시에 보내
+        처리량(req/s), p50/p95/p99 지연 시간, 서버 최대 RSS를 측정
+
+결과는 JSON 파일(기본: benchmarks/results/<시각>.json)로 저장되므로 실행끼리 비교할 수 있습니다.
+
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --only load --requests 400 --concurrency 32 --gemini-latency 0.5
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("CORS_ORIGINS", "*")
+os.environ.setdefault("APP_BASE_URL", "http://127.0.0.1:8000")
+
+from benchmarks.fakes import FIXTURE_PATH, FixtureServer, make_jpeg
+
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def summarize_ms(samples: list[float]) -> dict:
+    """초 단위 측정값 목록을 ms 단위 통계로 요약합니다."""
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        "count": len(ms),
+        "mean_ms": round(sum(ms) / len(ms), 3),
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "max_ms": round(ms[-1], 3),
+    }
+
+def time_calls(fn, iterations: int) -> dict:
+    fn()  # 첫 호출(템플릿/카탈로그 로딩)은 제외
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return summarize_ms(samples)
+
+def run_micro(iterations: int) -> dict:
+    from benchmarks.fakes import CANNED_RESULT
+    from ingredient_recommendation import get_ingredient_recommendations
+    from schemas import SkinScores
+    from services.chart import create_radar_chart, render_chart
+    from services.product_parser import parse_products_html
+
+    scores = SkinScores(**CANNED_RESULT["scores"])
+    priorities = CANNED_RESULT["priorities"]
+    with open(FIXTURE_PATH, encoding="utf-8") as f:
+        html = f.read()
+
+    cases = {
+        "create_radar_chart_png": lambda: create_radar_chart(scores),
+        "render_chart_svg": lambda: render_chart(scores, "svg"),
+        "get_ingredient_recommendations": lambda: get_ingredient_recommendations(scores, priorities),
+        "parse_products_html": lambda: parse_products_html(html, 3),
+    }
+    results = {}
+    for name, fn in cases.items():
+        results[name] = time_calls(fn, iterations)
+        print(f"  {name:<32} mean {results[name]['mean_ms']:>9.3f} ms  p95 {results[name]['p95_ms']:>9.3f} ms")
+    return results
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _max_rss_mb(pid: int) -> float | None:
+    """리눅스 /proc에서 프로세스의 최대 RSS(VmHWM)를 읽습니다."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+async def _wait_until_ready(client, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/")).status_code == 200:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("앱 서버가 시작되지 않았습니다.")
+
+async def _drive_load(base_url: str, args) -> dict:
+    import httpx
+
+    images = [make_jpeg(seed) for seed in range(args.unique_images)]
+    # 처리량/지연 시간은 200 응답만으로 계산 (429/503 같은 빠른 거절이 섞이면 수치가 부풀려짐)
+    latencies: list[float] = []
+    error_latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    counter = iter(range(args.requests))
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        await _wait_until_ready(client)
+        # 부팅 직후 크롤링(fixture 서버 대상)이 끝나도록 잠시 대기
+        await asyncio.sleep(args.warmup)
+
+        async def worker():
+            for i in counter:
+                image = images[i % len(images)]
+                started = time.perf_counter()
+                try:
+                    response = await client.post(
+                        "/skin/diagnosis",
+                        params={"format": args.chart_format},
+                        files={"image": (f"bench-{i}.jpg", image, "image/jpeg")},
+                    )
+                    status = str(response.status_code)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                (latencies if status == "200" else error_latencies).append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_s": round(len(latencies) / elapsed, 2),
+        "ok_requests": len(latencies),
+        "failed_requests": len(error_latencies),
+        "status_counts": statuses,
+        "latency": summarize_ms(latencies) if latencies else None,
+        "failed_latency": summarize_ms(error_latencies) if error_latencies else None,
+    }
+
+def run_load(args) -> dict:
+    port = _free_port()
+    with FixtureServer(latency=args.fixture_latency) as fixture, tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "FAKE_GEMINI_LATENCY": str(args.gemini_latency),
+            "FAKE_GEMINI_JITTER": str(args.gemini_jitter),
+            "OLIVEYOUNG_BASE_URL": fixture.base_url,
+            "CRAWL_ENGINE": "httpx",
+            "CACHE_DB_PATH": os.path.join(tmp, "bench.sqlite3"),
+            "APP_BASE_URL": f"http://127.0.0.1:{port}",
+            # 모든 요청이 127.0.0.1 한 클라이언트에서 오므로 허용 제어를 끄고 서버 처리량만 측정
+            "ADMISSION_ENABLED": "false",
+        }
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "benchmarks.fake_app:app",
+             "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+            cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            result = asyncio.run(_drive_load(f"http://127.0.0.1:{port}", args))
+            result["server_max_rss_mb"] = _max_rss_mb(server.pid)
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    result.update({
+        "gemini_latency_s": args.gemini_latency,
+        "unique_images": args.unique_images,
+        "chart_format": args.chart_format,
+    })
+    lat = result["latency"]
+    if lat is None:
+        raise RuntimeError(f"성공한 요청이 없습니다: {result['status_counts']}")
+    print(
+        f"  {result['requests_per_s']} req/s (200 응답 기준), p50 {lat['p50_ms']} ms, p95 {lat['p95_ms']} ms, "
+        f"p99 {lat['p99_ms']} ms, RSS {result['server_max_rss_mb']} MB, status {result['status_counts']}"
+    )
+    if result["failed_requests"]:
+        print(f"  경고: 200이 아닌 응답 {result['failed_requests']}/{args.requests}개는 처리량/지연 시간에서 제외했습니다.")
+    return result
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", choices=["micro", "load"], help="한 종류만 실행")
+    parser.add_argument("--iterations", type=int, default=200, help="micro 벤치마크 반복 횟수")
+    parser.add_argument("--requests", type=int, default=200, help="부하 테스트 총 요청 수")
+    parser.add_argument("--concurrency", type=int, default=16, help="부하 테스트 동시 요청 수")
+    parser.add_argument("--unique-images", type=int, default=200, help="서로 다른 업로드 이미지 수 (적을수록 결과 캐시 적중)")
+    parser.add_argument("--chart-format", choices=["png", "svg", "scores"], default="png")
+    parser.add_argument("--gemini-latency", type=float, default=1.0, help="가짜 Gemini 응답 지연(초)")
+    parser.add_argument("--gemini-jitter", type=float, default=0.2)
+    parser.add_argument("--fixture-latency", type=float, default=0.05, help="fixture 서버 응답 지연(초)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="부하 전 대기 시간(초)")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/<시각>.json)")
+    args = parser.parse_args()
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+    if args.only in (None, "micro"):
+        print("micro 벤치마크")
+        report["micro"] = run_micro(args.iterations)
+    if args.only in (None, "load"):
+        print("부하 테스트 (/skin/diagnosis)")
+        report["load"] = run_load(args)
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {os.path.relpath(output, ROOT_DIR)}")
+
+if __name__ == "__main__":
+    main()
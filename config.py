@@ -1,11 +1,126 @@
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     GEMINI_API_KEY: str
     CORS_ORIGINS: str
-    APP_BASE_URL: str 
+    APP_BASE_URL: str
+
+    # Gemini 호출 동시성/대기열/제한 시간 설정
+    GEMINI_MAX_CONCURRENCY: int = 4
+    GEMINI_MAX_QUEUE: int = 16
+    GEMINI_TIMEOUT_SECONDS: float = 60.0
+
+    # 진단 요청 허용 제어 (POST /skin/diagnosis*만 적용, / 와 조회 라우트는 항상 통과)
+    # 클라이언트(API 키 헤더 또는 IP)별 토큰 버킷: 초당 RATE개씩 최대 BURST개까지 충전, 부족하면 429
+    # 전체 동시 분석 수가 MAX_IN_FLIGHT를 넘으면 최대 MAX_QUEUED개까지 QUEUE_TIMEOUT 동안 대기, 그 외에는 503
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_API_KEY_HEADER: str = "X-API-Key"
+    # 등록된 API 키 (쉼표로 구분). 이 목록에 있는 키만 키별로 제한하고, 없거나 모르는 키는 IP로 제한
+    ADMISSION_API_KEYS: str = ""
+    # X-Forwarded-For를 믿을 프록시 주소/대역 (쉼표로 구분, "*"이면 모든 주소). 비어 있으면 연결된 주소를 그대로 사용
+    # (Render 같은 리버스 프록시 뒤에서는 설정하지 않으면 모든 익명 클라이언트가 프록시 IP 하나로 묶임)
+    ADMISSION_TRUSTED_PROXIES: str = ""
+    # 같은 IP를 여러 사용자가 공유해도(NAT, 프록시) 서비스 전체가 막히지 않도록 넉넉하게 설정 (전체 부하는 MAX_IN_FLIGHT로 제한)
+    ADMISSION_CLIENT_RATE_PER_SECOND: float = 5.0
+    ADMISSION_CLIENT_BURST: int = 50
+    ADMISSION_MAX_IN_FLIGHT: int = 20
+    ADMISSION_MAX_QUEUED: int = 20
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    ADMISSION_MAX_CLIENTS: int = 10000
+
+    # 피부 사진 사전 판별 (확실히 피부 사진이 아니면 Gemini 호출 없이 응답)
+    PRESCREEN_ENABLED: bool = True
+    PRESCREEN_SIZE: int = 128
+    PRESCREEN_MIN_SKIN_RATIO: float = 0.03
+    PRESCREEN_MIN_CONTRAST: float = 2.0
+    PRESCREEN_MIN_SHARPNESS: float = 0.5
+    PRESCREEN_MIN_BRIGHTNESS: float = 20.0
+    PRESCREEN_MAX_BRIGHTNESS: float = 245.0
+    PRESCREEN_MAX_FLAT_RATIO: float = 0.6
+
+    # 여러 장 진단(/skin/diagnosis/multi) 설정
+    MULTI_IMAGE_MAX: int = 3
+
+    # 분석 결과 캐시 설정 (backend: memory / sqlite)
+    CACHE_DB_PATH: str = ".cache/skin-api.sqlite3"
+    RESULT_CACHE_BACKEND: str = "memory"
+    RESULT_CACHE_MAX_ENTRIES: int = 256
+    RESULT_CACHE_TTL_SECONDS: float = 3600.0
+
+    # 크롤링 제품 캐시 설정 (backend: memory / sqlite)
+    # TTL이 지나면 기존 값으로 응답하면서 백그라운드에서 갱신, MAX_STALE이 지나면 삭제
+    PRODUCT_CACHE_BACKEND: str = "sqlite"
+    PRODUCT_CACHE_TTL_SECONDS: float = 24 * 3600
+    PRODUCT_CACHE_MAX_STALE_SECONDS: float = 7 * 24 * 3600
+
+    # 여러 워커 실행 시 리더 선출 (잠금 파일을 잡은 워커만 크롤링/스케줄러 실행, 리더가 죽으면 POLL 간격 안에 다른 워커가 이어받음)
+    # 메모리 제품 캐시는 워커끼리 공유되지 않으므로 선출하지 않고 워커마다 실행
+    LEADER_ELECTION: bool = True
+    LEADER_LOCK_PATH: str = ".cache/leader.lock"
+    LEADER_POLL_SECONDS: float = 5.0
+
+    # 크롤링 엔진 (httpx: 브라우저 없이 HTML 요청 후 파싱, 결과가 없으면 playwright로 재시도 / playwright: 항상 브라우저 사용)
+    CRAWL_ENGINE: str = "httpx"
+    # 검색 페이지 주소 (벤치마크에서는 로컬 fixture 서버로 바꿔서 사용)
+    OLIVEYOUNG_BASE_URL: str = "https://www.oliveyoung.co.kr"
+    CRAWL_HTTP_TIMEOUT_SECONDS: float = 15.0
+
+    # 크롤러 브라우저 설정 (동시 크롤링 수 = 페이지 풀 크기, N 페이지마다 브라우저 재시작, 0이면 재시작 안 함)
+    CRAWL_CONCURRENCY: int = 2
+    CRAWL_BROWSER_RECYCLE_PAGES: int = 50
+    CRAWL_TOP_N: int = 3
+    CRAWL_REFRESH_CONCURRENCY: int = 1
+
+    # 크롤링 시도별 제한 시간 (브라우저 페이지 이동 / 제품 목록 대기 / 성분 1개 전체 시도), 브라우저 재시도 횟수
+    CRAWL_PAGE_TIMEOUT_SECONDS: float = 30.0
+    CRAWL_SELECTOR_TIMEOUT_SECONDS: float = 20.0
+    CRAWL_ATTEMPT_TIMEOUT_SECONDS: float = 120.0
+    CRAWL_BROWSER_ATTEMPTS: int = 2
+    # 성분별 실패 백오프 (BASE * 2^(연속 실패 수-1), 최대 MAX, 지터 포함)
+    CRAWL_BACKOFF_BASE_SECONDS: float = 30.0
+    CRAWL_BACKOFF_MAX_SECONDS: float = 1800.0
+    # 적응형 동시 크롤링 수 (1 ~ CRAWL_CONCURRENCY): 이 시간 안에 성공하면 늘리고, 실패하거나 느리면 절반으로 줄임
+    CRAWL_TARGET_LATENCY_SECONDS: float = 20.0
+
+    # 진단 응답 단계별 제한 시간 (차트가 시간을 넘기면 차트 없이 응답)
+    CHART_MAX_WORKERS: int = 2
+    CHART_BUDGET_SECONDS: float = 3.0
+    RECOMMEND_BUDGET_SECONDS: float = 1.0
+
+    # 비동기 진단 작업(/skin/diagnosis/jobs) 설정
+    JOB_WORKERS: int = 4
+    JOB_QUEUE_MAX: int = 100
+    JOB_RESULT_TTL_SECONDS: float = 600.0
+
+    # 서버 시작 (무거운 모듈은 지연 로딩, STARTUP_WARMUP이면 첫 요청 후 백그라운드에서 미리 불러옴)
+    STARTUP_WARMUP: bool = True
+    STARTUP_WARMUP_DELAY_SECONDS: float = 2.0
+
+    # 응답 압축 (Accept-Encoding: br > gzip, brotli 패키지가 없으면 gzip만)
+    COMPRESSION_MIN_BYTES: int = 1000
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4
+
+    # 업로드 이미지 전처리 설정 (IMAGE_FORMAT: JPEG / WEBP)
+    UPLOAD_MAX_BYTES: int = 15 * 1024 * 1024
+    IMAGE_MAX_PIXELS: int = 50_000_000
+    IMAGE_MAX_EDGE: int = 1024
+    IMAGE_FORMAT: str = "JPEG"
+    IMAGE_QUALITY: int = 85
+
+    @field_validator("IMAGE_FORMAT")
+    @classmethod
+    def normalize_image_format(cls, value: str) -> str:
+        # 잘못된 값이면 요청마다 500이 나지 않도록 서버 시작 시점에 실패
+        value = value.strip().upper()
+        if value == "JPG":
+            value = "JPEG"
+        if value not in ("JPEG", "WEBP"):
+            raise ValueError("IMAGE_FORMAT은 JPEG 또는 WEBP만 가능합니다.")
+        return value
 
     class Config:
         env_file = ".env"
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
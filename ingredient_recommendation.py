@@ -14,93 +14,258 @@ def load_ingredients():
         print(f"Error: {INGREDIENTS_FILE_PATH} not found.")
         return []
 
+# 고민 순위별 가중치 (1순위: +20, 2순위: +10, 3순위: +5)
+PRIORITY_WEIGHTS = (20, 10, 5)
+# 여러 고민을 동시에 해결하는 경우의 시너지 보너스
+SYNERGY_BONUS = 15
+# 민감성 피부일 때의 감점 (High: 사실상 제외, Medium: 후순위 배치)
+SENSITIVITY_PENALTIES = {"High": 100, "Medium": 20}
+# 추천 개수
+MAX_RECOMMENDATIONS = 3
+
+GENERAL_REASON = "전반적인 피부 컨디션 개선을 위해 추천"
+
+# 배치 추천 API의 점수 배열 순서 (SkinScores 필드 순서와 동일)
+SCORE_KEYS = ["wrinkles", "pores", "pigmentation", "acne", "redness", "elasticity", "hydration"]
+
+class Ingredient:
+    """성분 1개의 추천 계산용 레코드 (기본 점수/민감성 감점을 미리 계산해 둠)"""
+    __slots__ = (
+        "index", "id", "name_ko", "name_en", "efficacy", "caution", "usage_time",
+        "target_concerns", "base_score", "sensitive_score",
+    )
+
+    def __init__(self, index: int, data: dict):
+        self.index = index
+        self.id = data["id"]
+        self.name_ko = data["name_ko"]
+        self.name_en = data["name_en"]
+        self.efficacy = data["efficacy"]
+        self.caution = data["caution"]
+        self.usage_time = data.get("usage_time", "ANY")
+        self.target_concerns = tuple(data.get("target_concerns", []))
+        self.base_score = data.get("match_score", 0)
+        self.sensitive_score = self.base_score - SENSITIVITY_PENALTIES.get(data.get("sensitivity_risk", "Low"), 0)
+
+    def to_recommendation(self, reason: str) -> IngredientRecommendation:
+        return IngredientRecommendation(
+            name_ko=self.name_ko,
+            name_en=self.name_en,
+            efficacy=self.efficacy,
+            caution=self.caution,
+            match_reason=reason,
+            usage_time=self.usage_time
+        )
+
+class IngredientCatalog:
+    """
+    성분 데이터를 한 번만 읽어 추천 계산에 맞게 색인한 카탈로그입니다.
+    - by_concern: 고민 -> 해당 고민을 다루는 성분 목록 (역색인)
+    - ranked / ranked_sensitive: 고민 가중치 없이 정렬한 성분 순위 (일반/민감성)
+    추천 시에는 상위 고민과 관련된 성분만 점수를 계산하고, 나머지는 미리 정렬된 순위에서 필요한 만큼만 꺼냅니다.
+    """
+    __slots__ = (
+        "ingredients", "by_concern", "ranked", "ranked_sensitive",
+        "concern_columns", "concern_matrix", "base_vector", "sensitive_vector", "unique_ids",
+    )
+
+    def __init__(self, records: list[dict]):
+        # numpy는 카탈로그를 처음 만들 때 불러옴 (서버 시작 시간 단축)
+        import numpy as np
+
+        self.ingredients = tuple(Ingredient(i, data) for i, data in enumerate(records))
+
+        by_concern: dict[str, list[Ingredient]] = {}
+        for ing in self.ingredients:
+            # 같은 고민이 중복으로 적혀 있어도 한 번만 색인 (가중치/추천 이유가 두 번 반영되지 않도록, 기존 `in` 검사와 동일)
+            for concern in dict.fromkeys(ing.target_concerns):
+                by_concern.setdefault(concern, []).append(ing)
+        self.by_concern = {concern: tuple(ings) for concern, ings in by_concern.items()}
+
+        # 점수 내림차순, 같은 점수는 파일 순서 유지 (기존 stable sort와 동일)
+        self.ranked = tuple(sorted(self.ingredients, key=lambda ing: (-ing.base_score, ing.index)))
+        self.ranked_sensitive = tuple(sorted(self.ingredients, key=lambda ing: (-ing.sensitive_score, ing.index)))
+
+        # 배치 추천용 행렬: 고민(열) x 성분(행) 포함 여부, 성분별 기본/민감성 점수
+        concerns = SCORE_KEYS + sorted(set(self.by_concern) - set(SCORE_KEYS))
+        self.concern_columns = {concern: i for i, concern in enumerate(concerns)}
+        self.concern_matrix = np.zeros((len(self.ingredients), len(concerns)), dtype=np.int64)
+        for ing in self.ingredients:
+            for concern in ing.target_concerns:
+                # 같은 고민이 중복으로 적혀 있어도 포함 여부(1)만 반영 (기존 `in` 검사와 동일)
+                self.concern_matrix[ing.index, self.concern_columns[concern]] = 1
+        self.base_vector = np.array([ing.base_score for ing in self.ingredients], dtype=np.int64)
+        self.sensitive_vector = np.array([ing.sensitive_score for ing in self.ingredients], dtype=np.int64)
+        self.unique_ids = len({ing.id for ing in self.ingredients}) == len(self.ingredients)
+
+    def recommend(self, scores, priorities: list[str]) -> list[IngredientRecommendation]:
+        # 1. 민감성 피부 판단 여부 (붉은기 50점 미만 or 트러블 40점 미만이면 민감성으로 간주)
+        is_sensitive = (scores.redness < 50) or (scores.acne < 40)
+        top_3_concerns = priorities[:len(PRIORITY_WEIGHTS)]
+
+        # 2. 상위 고민과 관련된 성분만 모아 고민 별 가중치 부여
+        # ing -> [가중치 합, 매칭된 고민 목록]
+        matched: dict[Ingredient, list] = {}
+        for idx, concern in enumerate(top_3_concerns):
+            weight = PRIORITY_WEIGHTS[idx]
+            for ing in self.by_concern.get(concern, ()):
+                entry = matched.get(ing)
+                if entry is None:
+                    matched[ing] = [weight, [concern]]
+                else:
+                    entry[0] += weight
+                    entry[1].append(concern)
+
+        candidates = []
+        for ing, (weight, concerns) in matched.items():
+            final_score = (ing.sensitive_score if is_sensitive else ing.base_score) + weight
+            # 3. 시너지 보너스 (여러 고민을 동시에 해결하는 경우)
+            if len(concerns) >= 2:
+                final_score += SYNERGY_BONUS
+            candidates.append((final_score, ing.index, ing, concerns))
+
+        # 4. 관련 없는 성분은 미리 정렬된 순위에서 추천 개수만큼만 후보로 추가
+        matched_ids = {ing.id for ing in matched}
+        extra_ids = set()
+        for ing in (self.ranked_sensitive if is_sensitive else self.ranked):
+            if len(extra_ids) >= MAX_RECOMMENDATIONS:
+                break
+            if ing in matched:
+                continue
+            final_score = ing.sensitive_score if is_sensitive else ing.base_score
+            if final_score < 0:
+                break
+            candidates.append((final_score, ing.index, ing, None))
+            if ing.id not in matched_ids:
+                extra_ids.add(ing.id)
+
+        # 점수 높은 순 정렬 (같은 점수는 파일 순서)
+        candidates.sort(key=lambda item: (-item[0], item[1]))
+
+        recommendations = []
+        recommended_ids = set()
+        for final_score, _, ing, concerns in candidates:
+            if len(recommendations) >= MAX_RECOMMENDATIONS:
+                break
+            if ing.id in recommended_ids:
+                continue
+            # 점수가 너무 낮으면(민감성 High Risk 등) 제외
+            if final_score < 0:
+                continue
+            # 추천 이유 생성
+            if concerns:
+                reason = f"{', '.join(concern_to_korean(c) for c in concerns)} 케어를 위해 추천"
+            else:
+                reason = GENERAL_REASON
+            recommendations.append(ing.to_recommendation(reason))
+            recommended_ids.add(ing.id)
+
+        return recommendations
+
+    def recommend_batch(self, score_matrix, priorities: list[list[str]] | None = None) -> list[list[IngredientRecommendation]]:
+        """
+        N개의 점수 프로필을 한 번에 추천합니다. (결과는 프로필마다 recommend()를 호출한 것과 동일)
+        score_matrix: (N, 7) 점수 배열 (SCORE_KEYS 순서)
+        priorities: 프로필별 고민 우선순위. 생략하면 점수가 낮은 순서(동점은 SCORE_KEYS 순서)로 정합니다.
+        """
+        import numpy as np
+
+        scores = np.asarray(score_matrix, dtype=np.int64).reshape(-1, len(SCORE_KEYS))
+        n_profiles, n_ingredients = len(scores), len(self.ingredients)
+        if n_profiles == 0:
+            return []
+        if n_ingredients == 0:
+            return [[] for _ in range(n_profiles)]
+
+        if priorities is None:
+            order = np.argsort(scores, axis=1, kind="stable")[:, :len(PRIORITY_WEIGHTS)]
+            priorities = [[SCORE_KEYS[i] for i in row] for row in order.tolist()]
+        top_concerns = [list(row[:len(PRIORITY_WEIGHTS)]) for row in priorities]
+
+        # 1. 프로필별 고민 가중치/매칭 횟수 (N x 고민 수) -> 행렬 곱으로 (N x M) 점수 계산
+        n_columns = len(self.concern_columns)
+        weights = np.zeros((n_profiles, n_columns), dtype=np.int64)
+        counts = np.zeros((n_profiles, n_columns), dtype=np.int64)
+        for row, concerns in enumerate(top_concerns):
+            for idx, concern in enumerate(concerns):
+                column = self.concern_columns.get(concern)
+                if column is not None:
+                    weights[row, column] += PRIORITY_WEIGHTS[idx]
+                    counts[row, column] += 1
+
+        matched_counts = counts @ self.concern_matrix.T
+        final = weights @ self.concern_matrix.T
+        # 2. 시너지 보너스
+        final += SYNERGY_BONUS * (matched_counts >= 2)
+        # 3. 민감성 피부(붉은기 50점 미만 or 트러블 40점 미만)는 감점된 기본 점수 사용
+        is_sensitive = (scores[:, SCORE_KEYS.index("redness")] < 50) | (scores[:, SCORE_KEYS.index("acne")] < 40)
+        final += np.where(is_sensitive[:, None], self.sensitive_vector[None, :], self.base_vector[None, :])
+
+        # 4. 점수 내림차순(동점은 파일 순서)으로 상위 성분 선택
+        # 점수와 순서를 하나의 정수 키로 합쳐 argpartition으로 필요한 만큼만 정렬
+        keys = final * n_ingredients + (n_ingredients - 1 - np.arange(n_ingredients))
+        k = MAX_RECOMMENDATIONS if self.unique_ids else n_ingredients
+        if k < n_ingredients:
+            top = np.argpartition(-keys, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(n_ingredients), keys.shape)
+        top_keys = np.take_along_axis(keys, top, axis=1)
+        ordered = np.take_along_axis(top, np.argsort(-top_keys, axis=1), axis=1)
+        ordered_scores = np.take_along_axis(final, ordered, axis=1)
+
+        # 추천 이유 문자열은 (성분, 상위 고민) 조합이 같으면 재사용
+        reasons: dict[tuple, str] = {}
+        results = []
+        for row, (indices, row_scores) in enumerate(zip(ordered.tolist(), ordered_scores.tolist())):
+            recommendations = []
+            recommended_ids = set()
+            for index, final_score in zip(indices, row_scores):
+                if len(recommendations) >= MAX_RECOMMENDATIONS or final_score < 0:
+                    break
+                ing = self.ingredients[index]
+                if ing.id in recommended_ids:
+                    continue
+                reason_key = (index, *top_concerns[row])
+                reason = reasons.get(reason_key)
+                if reason is None:
+                    concerns = [c for c in top_concerns[row] if c in ing.target_concerns]
+                    if concerns:
+                        reason = f"{', '.join(concern_to_korean(c) for c in concerns)} 케어를 위해 추천"
+                    else:
+                        reason = GENERAL_REASON
+                    reasons[reason_key] = reason
+                recommendations.append(ing.to_recommendation(reason))
+                recommended_ids.add(ing.id)
+            results.append(recommendations)
+        return results
+
+_catalog: IngredientCatalog | None = None
+_catalog_version = None
+
+def get_catalog() -> IngredientCatalog:
+    """성분 카탈로그를 반환합니다. ingredients.json이 수정되면(mtime 변경) 자동으로 다시 읽습니다."""
+    global _catalog, _catalog_version
+    try:
+        stat = os.stat(INGREDIENTS_FILE_PATH)
+        version = (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        version = None
+
+    if _catalog is None or version != _catalog_version:
+        _catalog = IngredientCatalog(load_ingredients())
+        _catalog_version = version
+    return _catalog
+
 def get_ingredient_recommendations(scores, priorities: list[str]) -> list[IngredientRecommendation]:
     """
     피부 분석 결과(priorities, scores)를 바탕으로 성분을 추천합니다.
     동적 스코어링 시스템을 적용하여, 개인별 고민 해결에 최적화된 성분을 선별합니다.
     """
-    all_ingredients = load_ingredients()
-    
-    # 1. 민감성 피부 판단 여부 (붉은기 50점 미만 or 트러블 40점 미만이면 민감성으로 간주)
-    is_sensitive = (scores.redness < 50) or (scores.acne < 40)
-    
-    scored_ingredients = []
-    top_3_concerns = priorities[:3]
-    
-    for ing in all_ingredients:
-        # 기본 점수
-        final_score = ing.get("match_score", 0)
-        matched_concerns = []
-        
-        # 2. 고민 별 가중치 부여
-        for idx, concern in enumerate(top_3_concerns):
-            if concern in ing.get("target_concerns", []):
-                matched_concerns.append(concern)
-                # 1순위: +20, 2순위: +10, 3순위: +5
-                if idx == 0:
-                    final_score += 20
-                elif idx == 1:
-                    final_score += 10
-                elif idx == 2:
-                    final_score += 5
-        
-        # 3. 시너지 보너스 (여러 고민을 동시에 해결하는 경우)
-        if len(matched_concerns) >= 2:
-            final_score += 15
-            
-        # 4. 민감성 페널티
-        sensitivity_risk = ing.get("sensitivity_risk", "Low")
-        if is_sensitive:
-            if sensitivity_risk == "High":
-                final_score -= 100  # 사실상 제외
-            elif sensitivity_risk == "Medium":
-                final_score -= 20   # 후순위 배치
-        
-        # 추천 이유 생성
-        reason = ""
-        if len(matched_concerns) > 0:
-            korean_concerns = [concern_to_korean(c) for c in matched_concerns]
-            reason = f"{', '.join(korean_concerns)} 케어를 위해 추천"
-        else:
-            reason = "전반적인 피부 컨디션 개선을 위해 추천"
-            
-        # 결과 저장
-        scored_ingredients.append({
-            "ingredient": ing,
-            "score": final_score,
-            "reason": reason
-        })
-    
-    # 점수 높은 순 정렬
-    scored_ingredients.sort(key=lambda x: x["score"], reverse=True)
-    
-    recommendations = []
-    recommended_ids = set()
-    
-    for item in scored_ingredients:
-        if len(recommendations) >= 3:
-            break
-            
-        ing = item["ingredient"]
-        if ing["id"] in recommended_ids:
-            continue
-        
-        # 점수가 너무 낮으면(민감성 High Risk 등) 제외
-        if item["score"] < 0:
-            continue
-
-        rec = IngredientRecommendation(
-            name_ko=ing["name_ko"],
-            name_en=ing["name_en"],
-            efficacy=ing["efficacy"],
-            caution=ing["caution"],
-            match_reason=item["reason"],
-            usage_time=ing.get("usage_time", "ANY")
-        )
-        recommendations.append(rec)
-        recommended_ids.add(ing["id"])
+    return get_catalog().recommend(scores, priorities)
 
-    return recommendations
+def get_batch_recommendations(score_matrix, priorities: list[list[str]] | None = None) -> list[list[IngredientRecommendation]]:
+    """여러 점수 프로필의 성분 추천을 NumPy 행렬 연산으로 한 번에 계산합니다. (야간 일괄 재추천용)"""
+    return get_catalog().recommend_batch(score_matrix, priorities)
 
 def concern_to_korean(concern: str) -> str:
     mapping = {
@@ -1,10 +1,27 @@
 from config import settings
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import asyncio
-from services.crawling import background_crawling_task, clear_cache, refresh_crawling_data
+from services.crawling import background_crawling_task, refresh_crawling_data
 from services.scheduler import keep_alive
+from services.browser import browser_manager
+from crawler import close_http_client
+from services.chart import get_chart_template
+from services.analysis import init_gemini
+from ingredient_recommendation import get_catalog
+from services.startup import first_response, get_startup_report, mark, mark_first_response
+from services.diagnosis import shutdown_chart_executor
+from services.jobs import job_queue
+from services.leader import leader
+from services.compression import CompressionMiddleware
+from services.admission import AdmissionMiddleware, admission
+from services.preprocess import FORM_OVERHEAD_BYTES, UploadLimitMiddleware
+from services.metrics import (
+    HTTP_IN_FLIGHT, HTTP_LATENCY, HTTP_REQUESTS, format_server_timing, render_metrics, start_request_timings,
+)
 from routers import skin
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 import logging
@@ -13,28 +30,68 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+async def warm_up():
+    """
+    지연 로딩한 무거운 모듈(google.genai, matplotlib, numpy)을 백그라운드 스레드에서 미리 불러옵니다.
+    첫 요청(/)에 응답한 뒤 시작해 절전 해제 직후의 헬스 체크를 늦추지 않으며,
+    요청이 없으면 STARTUP_WARMUP_DELAY_SECONDS 후에 시작합니다.
+    """
+    try:
+        await asyncio.wait_for(first_response.wait(), settings.STARTUP_WARMUP_DELAY_SECONDS)
+    except asyncio.TimeoutError:
+        pass
+
+    # GIL 경합을 줄이기 위해 하나씩 순서대로 불러옴
+    for warm in (init_gemini, get_chart_template, get_catalog):
+        try:
+            await asyncio.to_thread(warm)
+        except Exception as e:
+            logger.warning(f"예열 실패 ({warm.__name__}): {e}")
+    mark("warmup_done")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # 시작 시 실행
-    # 크롤링을 백그라운드 태스크로 실행하여 서버 부팅을 막지 않음
-    task = asyncio.create_task(background_crawling_task())
-    
-    # 스케줄러 설정 및 시작
     scheduler = AsyncIOScheduler()
-    scheduler.add_job(keep_alive, "interval", minutes=14)
+    crawl_tasks = []
 
-    # TODO: 버그로 인한 임시 주석 처리
-    # 매일 자정(00:00)에 크롤링 데이터 갱신
-    # scheduler.add_job(refresh_crawling_data, "cron", hour=0, minute=0)
-    
-    scheduler.start()
+    def start_leader_jobs():
+        """리더 워커에서만 크롤링과 스케줄러 작업을 시작합니다. (팔로워는 리더가 죽어 이어받을 때 실행)"""
+        # 크롤링을 백그라운드 태스크로 실행하여 서버 부팅을 막지 않음
+        crawl_tasks.append(asyncio.create_task(background_crawling_task()))
+
+        # 스케줄러 설정 및 시작
+        scheduler.add_job(keep_alive, "interval", minutes=14)
+
+        # 매일 자정(00:00)에 크롤링 데이터 갱신 (갱신 중에도 기존 캐시로 응답)
+        scheduler.add_job(refresh_crawling_data, "cron", hour=0, minute=0)
+
+        scheduler.start()
+
+    # 여러 워커로 실행해도 크롤링/스케줄러는 리더 하나만 실행
+    leader.start(start_leader_jobs)
+
+    # 비동기 진단 작업 워커 시작
+    job_queue.start()
+
+    # Gemini 클라이언트, 차트 템플릿(정적 배경), 성분 카탈로그를 미리 준비해 첫 진단 요청의 지연을 줄임
+    if settings.STARTUP_WARMUP:
+        asyncio.create_task(warm_up())
+
+    mark("ready")
     
     yield
     
     # 종료 시 실행 (필요한 경우)
-    task.cancel() # 혹은 await task
-    scheduler.shutdown()
-    clear_cache()
+    for task in crawl_tasks:
+        task.cancel()
+    if scheduler.running:
+        scheduler.shutdown()
+    await leader.stop()
+    await job_queue.stop()
+    await browser_manager.close()
+    await close_http_client()
+    shutdown_chart_executor()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -42,6 +99,57 @@ app = FastAPI(lifespan=lifespan)
 def read_root():
     return {"message": "Hello, Skin API is running!"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def read_metrics():
+    """Prometheus 텍스트 형식 메트릭"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/startup")
+def read_startup_report():
+    """프로세스 시작 기준 단계별 시간(app_imported / ready / first_200 / warmup_done)과 지연 로딩한 모듈별 import 시간"""
+    return get_startup_report()
+
+# 진단 요청 허용 제어 (가장 안쪽에 두어 429/503 응답도 요청 메트릭과 CORS 헤더가 적용되도록 함)
+app.add_middleware(
+    AdmissionMiddleware,
+    controller=admission,
+    api_key_header=settings.ADMISSION_API_KEY_HEADER,
+    api_keys=settings.ADMISSION_API_KEYS,
+    trusted_proxies=settings.ADMISSION_TRUSTED_PROXIES,
+)
+
+# 업로드 본문 크기 제한 (허용 제어보다 먼저 거절해 큰 업로드가 분석 자리나 토큰을 쓰지 않도록 함)
+# 여러 장 진단은 사진마다 UPLOAD_MAX_BYTES까지 허용하므로 MULTI_IMAGE_MAX장 기준
+app.add_middleware(
+    UploadLimitMiddleware,
+    max_bytes=settings.UPLOAD_MAX_BYTES * settings.MULTI_IMAGE_MAX + FORM_OVERHEAD_BYTES,
+)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """라우트별 요청 수/지연 시간/처리 중 요청 수를 기록하고, 단계별 시간을 Server-Timing 헤더로 내려줍니다."""
+    timings = start_request_timings()
+    started = time.perf_counter()
+    HTTP_IN_FLIGHT.inc()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        HTTP_IN_FLIGHT.dec()
+        elapsed = time.perf_counter() - started
+        route = request.scope.get("route")
+        route_path = route.path if route is not None else "unmatched"
+        HTTP_LATENCY.observe(elapsed, method=request.method, route=route_path)
+        HTTP_REQUESTS.inc(method=request.method, route=route_path, status=status)
+
+    if status == 200 and request.url.path == "/":
+        mark_first_response()
+
+    timings.append(("total", elapsed))
+    response.headers["Server-Timing"] = format_server_timing(timings)
+    return response
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
@@ -49,4 +157,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.include_router(skin.router)
\ No newline at end of file
+# 응답 본문 압축 (SSE 스트림과 이미지/multipart 응답은 제외)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_BYTES,
+    gzip_level=settings.GZIP_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY,
+)
+
+app.include_router(skin.router)
+
+mark("app_imported")
@@ -1,53 +1,278 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from services.analysis import analyze_image_with_gemini
-from services.chart import create_radar_chart
-from schemas import AnalysisResponse
-from ingredient_recommendation import get_ingredient_recommendations
-from services.crawling import get_cached_products
+import asyncio
+import json
+from typing import Literal
+from fastapi import APIRouter, UploadFile, File, Form, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from services.analysis import AnalysisBusyError, AnalysisTimeoutError
+from services.diagnosis import (
+    analyze, attach_products, describe_error, diagnose, diagnose_multi, get_cached_response, make_response,
+    recommend_within_budget, render_chart_within_budget,
+)
+from schemas import (
+    AnalysisResponse, BatchRecommendationRequest, BatchRecommendationResponse, DiagnosisJob, MultiAnalysisResponse,
+)
+from config import settings
+from services.jobs import job_queue, JobQueueFullError
+from ingredient_recommendation import get_batch_recommendations
+from services.preprocess import open_image, read_upload, ImageTooLargeError, InvalidImageError
+from services.result_cache import make_cache_key, set_cached_result, get_result_cache_stats
+from services.singleflight import get_singleflight_stats
+from services.prescreen import get_prescreen_stats
+from services.leader import leader
+from services.crawling import get_crawl_status
+from services.admission import admission
+from services.metrics import stage_timer
+from services.serialization import MultipartAnalysisResponse, SkinJSONResponse, wants_multipart
 
 router = APIRouter(
     prefix="/skin",
-    tags=["Skin Analysis"]
+    tags=["Skin Analysis"],
+    default_response_class=SkinJSONResponse
 )
 
+ChartFormat = Literal["png", "svg", "scores"]
+
+def resolve_chart_format(chart_format: str | None, accept: str | None) -> str:
+    """format 쿼리 파라미터 > Accept 헤더 순으로 차트 형식을 결정합니다. (기본값: png)"""
+    if chart_format:
+        return chart_format
+    if accept and "image/svg+xml" in accept:
+        return "svg"
+    return "png"
+
 @router.post("/diagnosis", response_model=AnalysisResponse)
 async def analyze_skin(
     image: UploadFile = File(...),
-    concern: str | None = Form(None)
+    concern: str | None = Form(None),
+    chart_format: ChartFormat | None = Query(None, alias="format", description="차트 형식 (png / svg / scores)"),
+    accept: str | None = Header(None)
 ):
+    chart_format = resolve_chart_format(chart_format, accept)
+
     try:
-        # 1. Gemini로 이미지 분석
-        result = await analyze_image_with_gemini(image, concern)
-        
-        graph_base64 = None
-        recommended_ingredients = []
-
-        if result.is_skin and result.total_score > 0:
-            # 2. 레이더 차트 생성
-            graph_base64 = create_radar_chart(result.scores)
-            
-            # 3. 성분 추천
-            recommended_ingredients = get_ingredient_recommendations(result.scores, result.priorities)
-
-            # 4. 추천 성분에 대한 제품 정보 매핑 (캐시 사용)
-            for ing in recommended_ingredients:
-                cached_products = get_cached_products(ing.name_ko)
-                if cached_products:
-                    ing.products = cached_products
-                else:
-                    print(f"Warning: Cache miss for ingredient {ing.name_ko}")
-                    ing.products = []
-        
-        return AnalysisResponse(
-            is_skin=result.is_skin,
-            diagnosis=result.diagnosis,
-            recommendation=result.recommendation,
-            scores=result.scores if result.is_skin else None,
-            priorities=result.priorities,
-            recommended_ingredients=recommended_ingredients,
-            graph_image=graph_base64
-        )
+        # 크기 제한을 걸고 업로드를 읽음
+        with stage_timer("upload"):
+            contents = await read_upload(image)
+
+        # 같은 사진 + 같은 코멘트로 분석한 결과가 있으면 바로 반환, 없으면 분석 후 차트/추천 생성
+        response = await diagnose(contents, concern, chart_format)
+
+    except ImageTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    except InvalidImageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    except AnalysisBusyError as e:
+        # 대기열 포화: 클라이언트가 잠시 후 재시도하도록 안내
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+
+    except AnalysisTimeoutError as e:
+        print(f"Error: {e}")
+        raise HTTPException(status_code=504, detail="피부 분석 시간 초과")
 
     except Exception as e:
         print(f"Error: {e}")
         raise HTTPException(status_code=500, detail="피부 분석 실패")
+
+    # Accept: multipart/mixed이면 차트를 base64 없이 원본 바이트로 전송
+    if wants_multipart(accept):
+        return MultipartAnalysisResponse(response)
+    return response
+
+# regions를 생략했을 때 업로드 순서대로 붙이는 부위 이름
+DEFAULT_REGIONS = ("front", "left", "right")
+
+@router.post("/diagnosis/multi", response_model=MultiAnalysisResponse)
+async def analyze_skin_multi(
+    images: list[UploadFile] = File(...),
+    regions: list[str] | None = Form(None, description="사진별 부위 이름 (생략 시 front, left, right 순서)"),
+    concern: str | None = Form(None),
+    chart_format: ChartFormat | None = Query(None, alias="format", description="차트 형식 (png / svg / scores)"),
+    accept: str | None = Header(None)
+):
+    """
+    정면/측면 등 여러 장의 사진을 한 번에 진단합니다.
+    Gemini 호출 한 번으로 사진별 점수를 받아 평균 점수로 차트 하나와 추천 한 번을 만듭니다.
+    """
+    chart_format = resolve_chart_format(chart_format, accept)
+
+    if len(images) > settings.MULTI_IMAGE_MAX:
+        raise HTTPException(status_code=400, detail=f"사진은 최대 {settings.MULTI_IMAGE_MAX}장까지 올릴 수 있습니다.")
+    if regions is None:
+        regions = [DEFAULT_REGIONS[i] if i < len(DEFAULT_REGIONS) else f"image{i + 1}" for i in range(len(images))]
+    elif len(regions) != len(images):
+        raise HTTPException(status_code=400, detail="regions는 사진 수와 같아야 합니다.")
+
+    try:
+        with stage_timer("upload"):
+            contents = [await read_upload(image) for image in images]
+        response = await diagnose_multi(contents, regions, concern, chart_format)
+
+    except Exception as e:
+        status, detail = describe_error(e)
+        headers = {"Retry-After": "5"} if status == 429 else None
+        raise HTTPException(status_code=status, detail=detail, headers=headers)
+
+    if wants_multipart(accept):
+        return MultipartAnalysisResponse(response)
+    return response
+
+# 스트림 첫 이벤트(analysis)에 담는 AnalysisResponse 필드
+ANALYSIS_EVENT_FIELDS = {"is_skin", "diagnosis", "recommendation", "scores", "priorities"}
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+async def stream_diagnosis_events(contents: bytes, concern: str | None, chart_format: str):
+    """
+    진단 단계가 끝날 때마다 SSE 이벤트를 보냅니다.
+    analysis(점수/진단) -> ingredients(추천 성분) -> products(제품 포함 성분) -> chart -> complete(/skin/diagnosis와 같은 전체 응답)
+    """
+    try:
+        cache_key = make_cache_key(contents, concern)
+        response = await get_cached_response(cache_key, chart_format)
+        if response is None:
+            result = await analyze(contents, concern, cache_key)
+            chart_task = None
+            recommended_ingredients = []
+            analyzed = make_response(result, [], None, chart_format)
+            yield format_sse("analysis", analyzed.model_dump(mode="json", include=ANALYSIS_EVENT_FIELDS))
+
+            if result.is_skin and result.total_score > 0:
+                # 차트는 바로 렌더링을 시작하고 추천/제품 이벤트를 먼저 보냄
+                chart_task = asyncio.create_task(render_chart_within_budget(result.scores, chart_format))
+                try:
+                    recommended_ingredients = await recommend_within_budget(result.scores, result.priorities)
+                    yield format_sse("ingredients", {
+                        "recommended_ingredients": [ing.model_dump(mode="json", exclude={"products"}) for ing in recommended_ingredients]
+                    })
+                    attach_products(recommended_ingredients)
+                    if recommended_ingredients:
+                        yield format_sse("products", {
+                            "recommended_ingredients": [ing.model_dump(mode="json") for ing in recommended_ingredients]
+                        })
+                except BaseException:
+                    # 클라이언트 연결이 끊기는 등 스트림이 중단되면 차트 작업도 취소
+                    chart_task.cancel()
+                    raise
+
+            graph_image = await chart_task if chart_task else None
+            response = make_response(result, recommended_ingredients, graph_image, chart_format)
+            set_cached_result(cache_key, result, response)
+        else:
+            yield format_sse("analysis", response.model_dump(mode="json", include=ANALYSIS_EVENT_FIELDS))
+            if response.recommended_ingredients:
+                yield format_sse("ingredients", {
+                    "recommended_ingredients": [ing.model_dump(mode="json", exclude={"products"}) for ing in response.recommended_ingredients]
+                })
+                yield format_sse("products", response.model_dump(mode="json", include={"recommended_ingredients"}))
+
+        yield format_sse("chart", response.model_dump(mode="json", include={"graph_image", "graph_format"}))
+        yield format_sse("complete", response.model_dump(mode="json"))
+
+    except Exception as e:
+        status, detail = describe_error(e)
+        yield format_sse("error", {"status": status, "detail": detail})
+
+@router.post("/diagnosis/stream")
+async def analyze_skin_stream(
+    image: UploadFile = File(...),
+    concern: str | None = Form(None),
+    chart_format: ChartFormat | None = Query(None, alias="format", description="차트 형식 (png / svg / scores)"),
+    accept: str | None = Header(None)
+):
+    """/skin/diagnosis와 같은 진단을 Server-Sent Events로 단계별로 전송합니다."""
+    chart_format = resolve_chart_format(chart_format, accept)
+
+    # 업로드 오류와 이미지가 아닌 파일은 스트림을 시작하기 전에 일반 HTTP 오류로 응답 (헤더만 확인)
+    try:
+        with stage_timer("upload"):
+            contents = await read_upload(image)
+        open_image(contents)
+    except ImageTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidImageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        stream_diagnosis_events(contents, concern, chart_format),
+        media_type="text/event-stream",
+        # 프록시가 이벤트를 모아서 보내지 않도록 버퍼링 해제
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/diagnosis/jobs", response_model=DiagnosisJob, status_code=202)
+async def create_diagnosis_job(
+    response: Response,
+    image: UploadFile = File(...),
+    concern: str | None = Form(None),
+    chart_format: ChartFormat | None = Query(None, alias="format", description="차트 형식 (png / svg / scores)"),
+    accept: str | None = Header(None)
+):
+    """진단을 작업으로 등록하고 바로 job_id를 반환합니다. 결과는 GET /skin/diagnosis/jobs/{job_id}로 조회합니다."""
+    chart_format = resolve_chart_format(chart_format, accept)
+
+    try:
+        with stage_timer("upload"):
+            contents = await read_upload(image)
+        job = job_queue.submit(contents, concern, chart_format)
+    except ImageTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+
+    response.headers["Location"] = f"{router.prefix}/diagnosis/jobs/{job.id}"
+    return job_queue.to_schema(job)
+
+@router.get("/diagnosis/jobs/stats")
+def read_diagnosis_job_stats():
+    """진단 작업 대기열 깊이, 실행 중인 작업 수, 평균 대기 시간을 반환합니다."""
+    return job_queue.get_stats()
+
+@router.get("/diagnosis/jobs/{job_id}", response_model=DiagnosisJob)
+def read_diagnosis_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다. (만료되었거나 잘못된 ID)")
+    return job_queue.to_schema(job)
+
+@router.post("/recommendations/batch", response_model=BatchRecommendationResponse)
+def recommend_batch(request: BatchRecommendationRequest):
+    """여러 점수 프로필의 성분 추천을 한 번에 계산합니다. (CPU 작업이므로 스레드풀에서 실행됨)"""
+    if request.priorities is not None and len(request.priorities) != len(request.scores):
+        raise HTTPException(status_code=422, detail="priorities 개수는 scores 개수와 같아야 합니다.")
+
+    return BatchRecommendationResponse(
+        recommendations=get_batch_recommendations(request.scores, request.priorities)
+    )
+
+@router.get("/cache/stats")
+def read_cache_stats():
+    """분석 결과 캐시의 히트/미스 통계를 반환합니다."""
+    return get_result_cache_stats()
+
+@router.get("/singleflight/stats")
+def read_singleflight_stats():
+    """동시에 들어온 같은 작업(분석/크롤링)이 병합된 횟수를 반환합니다."""
+    return get_singleflight_stats()
+
+@router.get("/prescreen/stats")
+def read_prescreen_stats():
+    """피부 사진 사전 판별 결과와 건너뛴 Gemini 호출 수를 반환합니다."""
+    return get_prescreen_stats()
+
+@router.get("/leader/status")
+def read_leader_status():
+    """이 워커가 크롤링/스케줄러를 실행하는 리더인지와 잠금 파일에 기록된 현재 리더를 반환합니다."""
+    return leader.get_status()
+
+@router.get("/admission/stats")
+def read_admission_stats():
+    """진단 요청 허용 제어 상태와 거절/대기가 많은 클라이언트를 반환합니다."""
+    return admission.get_stats()
+
+@router.get("/crawl/status")
+def read_crawl_status():
+    """성분별 크롤링 상태(마지막 성공, 연속 실패, 백오프), 적응형 동시 실행 수와 처리량을 반환합니다."""
+    return get_crawl_status()
@@ -1,3 +1,5 @@
+from datetime import datetime
+from typing import Annotated
 from pydantic import BaseModel, Field
 
 class Product(BaseModel):
@@ -32,6 +34,16 @@ class GeminiAnalysisResult(BaseModel):
     diagnosis: str
     recommendation: str
 
+class GeminiRegionResult(BaseModel):
+    region: str = Field(description="촬영 부위 (예: front / left / right)")
+    is_skin: bool
+    scores: SkinScores
+
+class GeminiMultiAnalysisResult(BaseModel):
+    regions: list[GeminiRegionResult] = Field(description="업로드 순서대로 사진별 분석 결과")
+    diagnosis: str
+    recommendation: str
+
 class AnalysisResponse(BaseModel):
     is_skin: bool
     diagnosis: str
@@ -40,3 +52,36 @@ class AnalysisResponse(BaseModel):
     priorities: list[str] = []
     recommended_ingredients: list[IngredientRecommendation] = Field(default=[])
     graph_image: str | None = None
+    graph_format: str = Field(default="png", description="graph_image 형식 (png: base64 PNG, svg: SVG 문자열, scores: 차트 없음)")
+
+class RegionScores(BaseModel):
+    region: str = Field(description="촬영 부위")
+    is_skin: bool
+    scores: SkinScores | None = None
+
+class MultiAnalysisResponse(AnalysisResponse):
+    regions: list[RegionScores] = Field(default=[], description="사진별 점수 (scores는 피부 사진으로 판별된 부위의 평균)")
+
+class BatchRecommendationRequest(BaseModel):
+    scores: list[Annotated[list[int], Field(min_length=7, max_length=7)]] = Field(
+        description="점수 배열 목록 (wrinkles, pores, pigmentation, acne, redness, elasticity, hydration 순서)"
+    )
+    priorities: list[list[str]] | None = Field(default=None, description="프로필별 고민 우선순위 (생략 시 점수가 낮은 순)")
+
+class BatchRecommendationResponse(BaseModel):
+    recommendations: list[list[IngredientRecommendation]]
+
+class DiagnosisJobError(BaseModel):
+    status: int = Field(description="/skin/diagnosis였다면 응답했을 HTTP 상태 코드")
+    detail: str
+
+class DiagnosisJob(BaseModel):
+    job_id: str
+    status: str = Field(description="queued / running / succeeded / failed")
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    queue_position: int | None = Field(default=None, description="대기 중일 때 앞에 남은 작업 수")
+    wait_seconds: float | None = Field(default=None, description="대기열에서 기다린 시간")
+    result: AnalysisResponse | None = None
+    error: DiagnosisJobError | None = None
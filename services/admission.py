@@ -0,0 +1,306 @@
+"""
+진단 요청 허용 제어 (클라이언트별 토큰 버킷 + 전체 동시 분석 수 제한)
+
+느린 Gemini 호출을 쓰는 진단 라우트(POST /skin/diagnosis*)만 'analysis' 레인으로 제한하고,
+/ (헬스 체크), /metrics, 통계 조회 같은 가벼운 요청은 'light' 레인으로 항상 바로 통과시킵니다.
+
+- 클라이언트(등록된 API 키이면 키, 그 외에는 IP, ADMISSION_TRUSTED_PROXIES 뒤에서는 X-Forwarded-For의 IP)마다 토큰 버킷으로 요청 속도를 제한 (초과 시 429 + Retry-After)
+- 전체 동시 분석 수가 ADMISSION_MAX_IN_FLIGHT에 도달하면 잠시 대기열에서 기다리고,
+  대기열이 가득 찼거나 ADMISSION_QUEUE_TIMEOUT_SECONDS 안에 자리가 나지 않으면 503 + Retry-After
+- 스트리밍 응답(SSE)은 응답이 끝날 때까지 동시 분석 수에 포함
+- 비동기 진단 작업은 등록 요청(POST /skin/diagnosis/jobs, 'jobs' 레인)에는 속도 제한만 적용하고,
+  워커가 작업을 실행하는 동안 같은 동시 분석 자리를 차지 (대기열 제한 시간 없이 기다림)
+"""
+import asyncio
+import hashlib
+import ipaddress
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from config import settings
+from services.metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUED, ADMISSION_REQUESTS, ADMISSION_WAIT
+
+# 'analysis' 레인으로 제한하는 경로 (POST만)
+ANALYSIS_PATH_PREFIX = "/skin/diagnosis"
+# 작업 등록은 바로 응답하므로 속도만 제한하는 'jobs' 레인 (분석 자리는 워커가 실행할 때 차지)
+JOBS_PATH = "/skin/diagnosis/jobs"
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, detail: str, retry_after: float, reason: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+        self.reason = reason
+
+@dataclass
+class _ClientState:
+    """클라이언트별 토큰 버킷과 통계"""
+    tokens: float
+    updated_at: float
+    admitted: int = 0
+    queued: int = 0
+    rejected: int = 0
+    last_seen: float = 0.0
+
+def lane_for(method: str, path: str) -> str:
+    if method == "POST" and path == JOBS_PATH:
+        return "jobs"
+    if method == "POST" and path.startswith(ANALYSIS_PATH_PREFIX):
+        return "analysis"
+    return "light"
+
+def parse_api_keys(value: str) -> frozenset[str]:
+    return frozenset(key.strip() for key in value.split(",") if key.strip())
+
+class TrustedProxies:
+    """X-Forwarded-For를 믿을 프록시 주소/대역 ("*"이면 모든 주소)"""
+
+    def __init__(self, value: str):
+        items = [item.strip() for item in value.split(",") if item.strip()]
+        self.trust_all = "*" in items
+        self.networks = [ipaddress.ip_network(item, strict=False) for item in items if item != "*"]
+
+    def __bool__(self) -> bool:
+        return self.trust_all or bool(self.networks)
+
+    def __contains__(self, host: str) -> bool:
+        if self.trust_all:
+            return True
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            return False
+        return any(address in network for network in self.networks)
+
+def client_ip(scope: Scope, trusted_proxies: TrustedProxies) -> str:
+    """
+    연결된 주소가 믿는 프록시이면 X-Forwarded-For를 오른쪽(가까운 프록시)부터 거슬러 올라가
+    믿는 프록시가 아닌 첫 주소를 사용 (클라이언트가 임의로 넣은 왼쪽 값으로 버킷을 바꾸지 못하도록)
+    """
+    client = scope.get("client")
+    host = client[0] if client else "unknown"
+    if not trusted_proxies or host not in trusted_proxies:
+        return host
+    forwarded = Headers(scope=scope).get("x-forwarded-for")
+    if not forwarded:
+        return host
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if hop not in trusted_proxies:
+            return hop
+    return hops[0] if hops else host
+
+def client_id(
+    scope: Scope, api_key_header: str, valid_api_keys: frozenset[str], trusted_proxies: TrustedProxies | None = None,
+) -> str:
+    """
+    등록된 API 키이면 키의 해시, 아니면 클라이언트 IP (믿는 프록시 뒤에서는 X-Forwarded-For 기준)
+    모르는 키로 식별하면 요청마다 키를 바꿔 새 버킷을 받을 수 있으므로 IP로 제한
+    """
+    api_key = Headers(scope=scope).get(api_key_header)
+    if api_key and api_key in valid_api_keys:
+        return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:12]
+    return "ip:" + client_ip(scope, trusted_proxies or TrustedProxies(""))
+
+class AdmissionController:
+    def __init__(
+        self,
+        rate_per_second: float,
+        burst: int,
+        max_in_flight: int,
+        max_queued: int,
+        queue_timeout_seconds: float,
+        max_clients: int = 10000,
+    ):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.max_clients = max_clients
+
+        self._clients: OrderedDict[str, _ClientState] = OrderedDict()
+        self._lock = threading.Lock()
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._in_flight = 0
+        self._queued = 0
+
+    def _client(self, client: str, now: float) -> _ClientState:
+        state = self._clients.get(client)
+        if state is None:
+            state = _ClientState(tokens=float(self.burst), updated_at=now)
+            self._clients[client] = state
+            # 오래 안 보인 클라이언트부터 정리 (메모리 제한)
+            while len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+        else:
+            self._clients.move_to_end(client)
+        state.last_seen = now
+        return state
+
+    def take_token(self, client: str) -> None:
+        """토큰이 없으면 다음 토큰까지 기다릴 시간을 담아 AdmissionRejected(429)를 발생시킵니다."""
+        now = time.monotonic()
+        with self._lock:
+            state = self._client(client, now)
+            state.tokens = min(float(self.burst), state.tokens + (now - state.updated_at) * self.rate_per_second)
+            state.updated_at = now
+            if state.tokens >= 1:
+                state.tokens -= 1
+                return
+            state.rejected += 1
+            wait = (1 - state.tokens) / self.rate_per_second if self.rate_per_second > 0 else 60.0
+        raise AdmissionRejected(429, "요청이 너무 많습니다. 잠시 후 다시 시도해 주세요.", wait, "rate_limited")
+
+    def _count(self, client: str, field_name: str) -> None:
+        with self._lock:
+            state = self._clients.get(client)
+            if state is not None:
+                setattr(state, field_name, getattr(state, field_name) + 1)
+
+    async def acquire_slot(self, client: str) -> None:
+        """
+        전체 동시 분석 자리를 얻습니다.
+        자리가 없으면 대기열에서 기다리고, 대기열이 가득 찼거나 제한 시간을 넘기면 AdmissionRejected(503)가 발생합니다.
+        """
+        if not self._slots.locked():
+            await self._slots.acquire()
+            self._enter()
+            return
+
+        if self._queued >= self.max_queued:
+            self._count(client, "rejected")
+            raise AdmissionRejected(503, "서버가 혼잡합니다. 잠시 후 다시 시도해 주세요.", self.queue_timeout_seconds, "overloaded")
+
+        self._count(client, "queued")
+        self._queued += 1
+        ADMISSION_QUEUED.inc()
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            self._count(client, "rejected")
+            raise AdmissionRejected(503, "서버가 혼잡합니다. 잠시 후 다시 시도해 주세요.", self.queue_timeout_seconds, "overloaded") from None
+        finally:
+            self._queued -= 1
+            ADMISSION_QUEUED.dec()
+            ADMISSION_WAIT.observe(time.perf_counter() - started)
+        self._enter()
+
+    def _enter(self) -> None:
+        self._in_flight += 1
+        ADMISSION_IN_FLIGHT.inc()
+
+    def release_slot(self) -> None:
+        self._in_flight -= 1
+        ADMISSION_IN_FLIGHT.dec()
+        self._slots.release()
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        백그라운드 작업용: 자리가 날 때까지 기다렸다가 끝나면 돌려줍니다.
+        (HTTP 요청과 달리 거절하지 않음, 허용 제어가 꺼져 있으면 바로 실행)
+        """
+        if not settings.ADMISSION_ENABLED:
+            yield
+            return
+        await self._slots.acquire()
+        self._enter()
+        try:
+            yield
+        finally:
+            self.release_slot()
+
+    async def admit(self, client: str, needs_slot: bool = True) -> None:
+        self.take_token(client)
+        if needs_slot:
+            await self.acquire_slot(client)
+        self._count(client, "admitted")
+
+    def get_stats(self, top: int = 20) -> dict:
+        """전체 상태와 거절/대기가 많은 클라이언트 (용량 산정용)"""
+        with self._lock:
+            clients = sorted(self._clients.items(), key=lambda item: (-item[1].rejected, -item[1].queued, -item[1].admitted))
+            top_clients = [
+                {"client": client, "admitted": s.admitted, "queued": s.queued, "rejected": s.rejected, "tokens": round(s.tokens, 2)}
+                for client, s in clients[:top]
+            ]
+            tracked = len(self._clients)
+        return {
+            "enabled": settings.ADMISSION_ENABLED,
+            "rate_per_second": self.rate_per_second,
+            "burst": self.burst,
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self._in_flight,
+            "max_queued": self.max_queued,
+            "queued": self._queued,
+            "tracked_clients": tracked,
+            "clients": top_clients,
+        }
+
+class AdmissionMiddleware:
+    """'analysis' 레인 요청에 허용 제어를 적용하는 ASGI 미들웨어 ('jobs' 레인은 속도 제한만, light 레인은 그대로 통과)"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        controller: AdmissionController,
+        api_key_header: str = "X-API-Key",
+        api_keys: str = "",
+        trusted_proxies: str = "",
+    ):
+        self.app = app
+        self.controller = controller
+        self.api_key_header = api_key_header
+        self.api_keys = parse_api_keys(api_keys)
+        self.trusted_proxies = TrustedProxies(trusted_proxies)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.ADMISSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        lane = lane_for(scope["method"], scope["path"])
+        if lane == "light":
+            ADMISSION_REQUESTS.inc(lane=lane, result="admitted")
+            await self.app(scope, receive, send)
+            return
+
+        client = client_id(scope, self.api_key_header, self.api_keys, self.trusted_proxies)
+        try:
+            await self.controller.admit(client, needs_slot=lane == "analysis")
+        except AdmissionRejected as e:
+            ADMISSION_REQUESTS.inc(lane=lane, result=e.reason)
+            response = JSONResponse(
+                {"detail": e.detail},
+                status_code=e.status_code,
+                headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+            )
+            await response(scope, receive, send)
+            return
+
+        ADMISSION_REQUESTS.inc(lane=lane, result="admitted")
+        if lane == "jobs":
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release_slot()
+
+admission = AdmissionController(
+    rate_per_second=settings.ADMISSION_CLIENT_RATE_PER_SECOND,
+    burst=settings.ADMISSION_CLIENT_BURST,
+    max_in_flight=settings.ADMISSION_MAX_IN_FLIGHT,
+    max_queued=settings.ADMISSION_MAX_QUEUED,
+    queue_timeout_seconds=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    max_clients=settings.ADMISSION_MAX_CLIENTS,
+)
@@ -1,14 +1,49 @@
-from google import genai
-from google.genai import types
-from fastapi import UploadFile
+import asyncio
 from config import settings
-from schemas import GeminiAnalysisResult
+from pydantic import BaseModel
+from schemas import GeminiAnalysisResult, GeminiMultiAnalysisResult
+from services.metrics import GEMINI_IN_FLIGHT, GEMINI_QUEUED, GEMINI_TOKENS, stage_timer
+from services.singleflight import SingleFlight
+from services.startup import timed_import
 
-client = genai.Client(api_key=settings.GEMINI_API_KEY)
+# google.genai는 불러오는 데 1초 가까이 걸리므로 첫 분석(또는 서버 시작 후 예열) 때 불러오고 클라이언트를 만듦
+client = None
+genai_types = None
 
-async def analyze_image_with_gemini(image: UploadFile, concern: str | None = None) -> GeminiAnalysisResult:
-    contents = await image.read()
-    
+MODEL_NAME = "gemini-2.5-flash-lite"
+# 프롬프트 내용을 바꾸면 올려주세요. (분석 결과 캐시 키에 포함됨)
+PROMPT_VERSION = "1"
+
+class AnalysisBusyError(Exception):
+    """Gemini 호출 대기열이 가득 차 더 이상 요청을 받을 수 없을 때 발생합니다."""
+
+class AnalysisTimeoutError(Exception):
+    """Gemini 호출이 제한 시간 안에 끝나지 않았을 때 발생합니다."""
+
+# 동시에 실행되는 Gemini 호출 수 제한 (나머지는 대기)
+_semaphore = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENCY)
+# 실행 중 + 대기 중인 호출 수 (대기열 깊이 제한에 사용)
+_pending = 0
+
+# 같은 사진 + 같은 코멘트(결과 캐시 키)로 동시에 들어온 분석 요청을 Gemini 호출 한 번으로 병합
+analysis_flight = SingleFlight("analysis")
+
+def init_gemini() -> None:
+    """google.genai를 불러오고 클라이언트를 만듭니다. 무거운 import이므로 스레드에서 호출하세요."""
+    global client, genai_types
+    if genai_types is None:
+        genai_types = timed_import("google.genai.types")
+    if client is None:
+        client = timed_import("google.genai").Client(api_key=settings.GEMINI_API_KEY)
+
+async def ensure_gemini() -> None:
+    if client is None or genai_types is None:
+        await asyncio.to_thread(init_gemini)
+
+def image_part(data: bytes, mime_type: str):
+    return genai_types.Part.from_bytes(data=data, mime_type=mime_type)
+
+def build_prompt(concern: str | None = None) -> str:
     user_comment_part = ""
     if concern:
         user_comment_part = f"""
@@ -76,21 +111,120 @@ async def analyze_image_with_gemini(image: UploadFile, concern: str | None = Non
         "recommendation": "정확한 분석을 위해 피부가 잘 보이도록 밝은 곳에서 가까이 촬영해 주세요."
         }}
     """
+    return prompt
+
+def build_multi_prompt(regions: list[str], concern: str | None = None) -> str:
+    user_comment_part = ""
+    if concern:
+        user_comment_part = f"""
+        [사용자 추가 코멘트]
+        사용자가 다음과 같은 고민이나 상태를 추가로 언급했습니다. 진단 및 추천에 이 내용을 비중 있게 반영해 주세요:
+        "{concern}"
+        """
+
+    prompt = f"""
+        당신은 20년 경력의 피부과 전문의이자 AI 피부 진단 전문가입니다.
+        같은 사람의 얼굴을 여러 방향에서 촬영한 사진 {len(regions)}장이 순서대로 주어집니다. (촬영 부위: {", ".join(regions)})
+        각 사진 앞에는 [사진: 부위] 표시가 있습니다. 다음 지침에 따라 JSON 형식으로 응답해 주세요.
+
+        {user_comment_part}
 
-    response = client.models.generate_content(
-        model="gemini-2.5-flash-lite", 
-        contents=[
-            prompt,
-            types.Part.from_bytes(
-                data=contents, 
-                mime_type=image.content_type,
-            )
+        [분석 단계]
+        1. 사진별 판별: 각 사진이 '사람의 얼굴 피부'를 근접 촬영한 사진인지 판단하세요. (메이크업이 진하거나, 너무 멀거나, 사물/동물인 경우 False)
+
+        2. 사진별 피부 점수 측정 (0~100점 척도, 피부 사진이 아니면 모두 0점):
+        - 100점에 가까울수록 '상태가 매우 좋고 결점이 없음'을, 0점에 가까울수록 '상태가 심각하고 개선이 시급함'을 의미합니다.
+        - 분석 항목 (7가지): wrinkles (주름), pores (모공), pigmentation (색소침착/잡티), acne (여드름/트러블),
+          redness (붉은기), elasticity (탄력 - 주름과 처짐을 보고 추론), hydration (수분 - 윤기, 각질, 사용자 코멘트 등을 종합하여 추론)
+
+        3. 종합 진단: 모든 사진을 함께 보고 부위별 차이를 반영한 진단과 관리 방법을 작성하세요.
+        피부 사진이 한 장도 없다면 diagnosis는 "피부 사진이 아닙니다.", recommendation은 촬영 안내 문구로 작성하세요.
+
+        [출력 형식]
+        반드시 아래 JSON 포맷만 출력하세요. regions에는 사진 순서대로 {len(regions)}개의 항목이 있어야 합니다.
+        {{
+        "regions": [
+            {{
+            "region": "front",
+            "is_skin": true,
+            "scores": {{
+                "wrinkles": 85, "pores": 40, "pigmentation": 70, "acne": 95, "redness": 60, "elasticity": 50, "hydration": 45
+            }}
+            }}
         ],
-        config={
-            'response_mime_type': 'application/json',
-            'response_schema': GeminiAnalysisResult,
-            'temperature': 0.0
-        }
-    )
+        "diagnosis": "이마와 코 주변 모공이 넓고, 왼쪽 볼에 붉은기가 상대적으로 심합니다.",
+        "recommendation": "수분을 충분히 공급하고 진정 관리가 필요합니다."
+        }}
+    """
+    return prompt
 
+async def generate_with_limits(contents: list, response_schema: type[BaseModel]) -> BaseModel:
+    """
+    동시 실행 수/대기열 깊이/제한 시간을 적용해 Gemini를 호출하고 파싱된 결과를 반환합니다.
+    대기열이 가득 차면 AnalysisBusyError, 제한 시간을 넘기면 AnalysisTimeoutError가 발생합니다.
+    """
+    global _pending
+
+    # 대기열이 가득 찼으면 바로 거절 (429)
+    if _pending >= settings.GEMINI_MAX_CONCURRENCY + settings.GEMINI_MAX_QUEUE:
+        raise AnalysisBusyError("분석 요청이 많아 잠시 후 다시 시도해 주세요.")
+
+    async def generate():
+        async with _semaphore:
+            GEMINI_IN_FLIGHT.inc()
+            try:
+                # 비동기 클라이언트를 사용하여 이벤트 루프를 막지 않음
+                return await client.aio.models.generate_content(
+                    model=MODEL_NAME,
+                    contents=contents,
+                    config={
+                        'response_mime_type': 'application/json',
+                        'response_schema': response_schema,
+                        'temperature': 0.0
+                    }
+                )
+            finally:
+                GEMINI_IN_FLIGHT.dec()
+
+    _pending += 1
+    GEMINI_QUEUED.set(_pending)
+    try:
+        # 대기 시간을 포함한 호출 전체에 제한 시간 적용
+        with stage_timer("gemini"):
+            response = await asyncio.wait_for(generate(), timeout=settings.GEMINI_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        raise AnalysisTimeoutError(f"Gemini 응답 시간 초과 ({settings.GEMINI_TIMEOUT_SECONDS}s)") from None
+    finally:
+        _pending -= 1
+        GEMINI_QUEUED.set(_pending)
+
+    record_token_usage(response.usage_metadata)
     return response.parsed
+
+async def analyze_image_with_gemini(contents: bytes, mime_type: str, concern: str | None = None) -> GeminiAnalysisResult:
+    await ensure_gemini()
+    prompt = build_prompt(concern)
+    return await generate_with_limits([prompt, image_part(contents, mime_type)], GeminiAnalysisResult)
+
+async def analyze_images_with_gemini(
+    images: list[tuple[bytes, str]], regions: list[str], concern: str | None = None
+) -> GeminiMultiAnalysisResult:
+    """
+    여러 부위 사진을 Gemini 호출 한 번으로 분석합니다.
+    images는 (이미지 바이트, MIME 타입) 목록이며 regions와 순서가 같아야 합니다.
+    프롬프트는 한 번만 보내므로 사진마다 따로 호출할 때보다 입력 토큰과 대기 시간이 줄어듭니다.
+    """
+    await ensure_gemini()
+    contents = [build_multi_prompt(regions, concern)]
+    for region, (data, mime_type) in zip(regions, images):
+        contents.append(f"[사진: {region}]")
+        contents.append(image_part(data, mime_type))
+    return await generate_with_limits(contents, GeminiMultiAnalysisResult)
+
+def record_token_usage(usage) -> None:
+    if usage is None:
+        return
+    for token_type, field in (("prompt", "prompt_token_count"), ("output", "candidates_token_count"), ("total", "total_token_count")):
+        count = getattr(usage, field, None)
+        if count:
+            GEMINI_TOKENS.inc(count, type=token_type)
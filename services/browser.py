@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+from config import settings
+from services.startup import timed_import
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page, Playwright
+
+logger = logging.getLogger(__name__)
+
+# 메모리가 작은 서버에서 Chromium을 띄우기 위한 옵션
+LAUNCH_ARGS = [
+    "--disable-gpu",
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-dev-shm-usage",  # 메모리 부족 시 /tmp 사용
+    "--disable-accelerated-2d-canvas",
+    "--no-first-run",
+    "--no-zygote",
+    "--single-process",  # 단일 프로세스로 실행 (주의: 불안정할 수 있으나 메모리 절약 효과 큼)
+    "--disable-extensions",
+]
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# 크롤링에 필요 없는 리소스 (폰트, 스타일시트 등)
+BLOCKED_RESOURCE_TYPES = {"media", "font", "stylesheet"}
+
+async def _block_resources(route):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+class BrowserManager:
+    """
+    앱 수명 동안 하나의 Chromium을 띄워두고 페이지를 재사용하는 관리자입니다.
+    - 동시에 빌려줄 수 있는 페이지 수는 pool_size로 제한
+    - 브라우저가 죽었거나 recycle_after 페이지를 처리하면, 사용 중인 페이지가 모두 반납된 뒤 브라우저를 다시 띄움
+    """
+
+    def __init__(self, pool_size: int, recycle_after: int = 0):
+        self.pool_size = pool_size
+        self.recycle_after = recycle_after
+
+        self._playwright: "Playwright | None" = None
+        self._browser: "Browser | None" = None
+        self._context: "BrowserContext | None" = None
+        self._idle_pages: list["Page"] = []
+        self._slots = asyncio.Semaphore(pool_size)
+        self._cond = asyncio.Condition()
+        self._active = 0
+        self._pages_since_launch = 0
+
+        self._stats = {"launches": 0, "pages_served": 0, "failures": 0, "busy_seconds": 0.0}
+
+    def _needs_launch(self) -> bool:
+        if self._browser is None or not self._browser.is_connected():
+            return True
+        return bool(self.recycle_after) and self._pages_since_launch >= self.recycle_after
+
+    async def _launch(self) -> None:
+        await self._shutdown_browser()
+
+        if self._playwright is None:
+            # playwright는 브라우저 크롤링이 처음 필요할 때 불러옴
+            playwright_api = await asyncio.to_thread(timed_import, "playwright.async_api")
+            self._playwright = await playwright_api.async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+        self._context = await self._browser.new_context(
+            viewport={"width": 1920, "height": 1080},
+            user_agent=USER_AGENT,
+        )
+        # 리소스 차단 라우트는 컨텍스트에 한 번만 등록
+        await self._context.route("**/*", _block_resources)
+        self._pages_since_launch = 0
+        self._stats["launches"] += 1
+        logger.info(f"크롤링 브라우저 시작 (누적 {self._stats['launches']}회)")
+
+    async def _shutdown_browser(self) -> None:
+        self._idle_pages.clear()
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception as e:
+                logger.warning(f"브라우저 종료 중 에러: {e}")
+        self._browser = None
+        self._context = None
+
+    async def _checkout(self) -> "Page":
+        async with self._cond:
+            # 재시작이 필요하면 빌려준 페이지가 모두 돌아올 때까지 기다렸다가 새 브라우저를 띄움
+            while self._needs_launch() and self._active > 0:
+                await self._cond.wait()
+            if self._needs_launch():
+                await self._launch()
+            self._active += 1
+            self._pages_since_launch += 1
+
+        try:
+            while self._idle_pages:
+                page = self._idle_pages.pop()
+                if not page.is_closed():
+                    return page
+            return await self._context.new_page()
+        except Exception:
+            await self._checkin(None)
+            raise
+
+    async def _checkin(self, page: "Page | None") -> None:
+        async with self._cond:
+            if page is not None and not page.is_closed() and not self._needs_launch():
+                self._idle_pages.append(page)
+            self._active -= 1
+            self._cond.notify_all()
+
+    @asynccontextmanager
+    async def page(self):
+        """
+        풀에서 페이지를 하나 빌려줍니다. 예외가 나거나 취소되면(wait_for 시간 초과 등) 그 페이지는 버리고 새로 만듭니다.
+        (이동 중이던 페이지를 풀에 돌려놓으면 다음 크롤링이 이전 페이지 상태를 보게 됨)
+        """
+        async with self._slots:
+            page = await self._checkout()
+            started = time.perf_counter()
+            discard = False
+            try:
+                yield page
+            except BaseException:
+                self._stats["failures"] += 1
+                discard = True
+                try:
+                    await page.close()
+                except BaseException:
+                    pass
+                raise
+            finally:
+                self._stats["pages_served"] += 1
+                self._stats["busy_seconds"] += time.perf_counter() - started
+                # 다시 취소되더라도 빌려준 페이지 수(_active)는 반드시 돌려놓음
+                await asyncio.shield(self._checkin(None if discard else page))
+
+    async def close(self) -> None:
+        async with self._cond:
+            await self._shutdown_browser()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    def get_stats(self) -> dict:
+        stats = dict(self._stats)
+        served = stats["pages_served"]
+        stats["busy_seconds"] = round(stats["busy_seconds"], 2)
+        stats["avg_page_seconds"] = round(self._stats["busy_seconds"] / served, 2) if served else 0.0
+        stats["pool_size"] = self.pool_size
+        stats["active_pages"] = self._active
+        return stats
+
+browser_manager = BrowserManager(
+    pool_size=settings.CRAWL_CONCURRENCY,
+    recycle_after=settings.CRAWL_BROWSER_RECYCLE_PAGES,
+)
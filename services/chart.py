@@ -1,78 +1,96 @@
-import os
-import io
+import math
 import base64
-import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-from matplotlib.patches import Circle, Wedge
 from schemas import SkinScores
+from services.startup import timed_import
+
+# 레이더 차트 축 순서 (SkinScores 필드명, 라벨)
+CHART_AXES = [
+    ("wrinkles", "주름"),
+    ("pores", "모공"),
+    ("pigmentation", "색소"),
+    ("acne", "트러블"),
+    ("redness", "붉은기"),
+    ("elasticity", "탄력"),
+    ("hydration", "수분"),
+]
+
+def _png_renderer():
+    # matplotlib은 PNG 차트를 처음 만들 때 불러옴 (서버 시작 시간 단축)
+    return timed_import("services.chart_png")
+
+def get_chart_template(offset: tuple[float, float] = (0.0, 0.0)):
+    """PNG 차트 템플릿 (services.chart_png.get_chart_template 참고)"""
+    return _png_renderer().get_chart_template(offset)
 
 def create_radar_chart(scores: SkinScores) -> str:
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    font_path = os.path.join(base_dir, "fonts", "NanumGothic-Bold.ttf")
-    
-    try:
-        font_prop = fm.FontProperties(fname=font_path)
-    except Exception:
-        font_prop = fm.FontProperties(family='Apple SD Gothic Neo')
+    png_bytes = _png_renderer().render_radar_chart_png(scores)
+    return base64.b64encode(png_bytes).decode('utf-8')
+
+# SVG 차트 크기/중심/반지름 (점수 100 = SVG_RADIUS)
+SVG_SIZE = 400
+SVG_CENTER = (200, 215)
+SVG_RADIUS = 140
+_SVG_ANGLES = [2 * math.pi * i / len(CHART_AXES) for i in range(len(CHART_AXES))]
+
+def _svg_point(angle: float, value: float) -> tuple[float, float]:
+    # 12시 방향에서 시작해 시계 방향으로 진행 (PNG 차트와 같은 배치)
+    r = SVG_RADIUS * value / 100
+    return SVG_CENTER[0] + r * math.sin(angle), SVG_CENTER[1] - r * math.cos(angle)
+
+def _svg_polygon_points(values: list[float]) -> str:
+    return " ".join(f"{x:.1f},{y:.1f}" for x, y in (_svg_point(a, v) for a, v in zip(_SVG_ANGLES, values)))
+
+def _build_svg_background() -> str:
+    """점수와 무관한 SVG 요소(영역 띠, 격자, 눈금, 안내 문구)를 한 번만 만듭니다."""
+    cx, cy = SVG_CENTER
+    parts = []
+    for low, high, color in ((70, 100, '#DDFFDD'), (40, 70, '#FFFEDD'), (0, 40, '#FFDDDD')):
+        # 바깥 띠부터 칠하고 안쪽 띠로 덮음 (투명도 0.5 유지를 위해 evenodd로 구멍을 냄)
+        inner = f' M{_svg_polygon_points([low] * len(_SVG_ANGLES))}Z' if low else ''
+        parts.append(f'<path d="M{_svg_polygon_points([high] * len(_SVG_ANGLES))}Z{inner}" fill="{color}" fill-opacity=".5" fill-rule="evenodd"/>')
+    grid = "".join(f'<circle cx="{cx}" cy="{cy}" r="{SVG_RADIUS * v / 100:g}"/>' for v in (20, 40, 60, 80, 100))
+    spokes = "".join(f'<line x1="{cx}" y1="{cy}" x2="{x:.1f}" y2="{y:.1f}"/>' for x, y in (_svg_point(a, 100) for a in _SVG_ANGLES))
+    parts.append(f'<g fill="none" stroke="grey" stroke-opacity=".5" stroke-dasharray="3 3">{grid}{spokes}</g>')
+    ticks = "".join(f'<text x="{cx + 3}" y="{cy - SVG_RADIUS * v / 100 - 2:g}">{v}</text>' for v in (20, 40, 60, 80, 100))
+    parts.append(f'<g font-size="8" fill="grey">{ticks}</g>')
+    parts.append(f'<text x="{SVG_SIZE / 2:g}" y="24" text-anchor="middle" font-size="13" font-weight="bold">바깥쪽으로 넓을수록 피부 상태가 좋습니다.</text>')
+    gx, gy = _svg_point(math.radians(45), 110)
+    parts.append(f'<text x="{gx:.1f}" y="{gy:.1f}" text-anchor="middle" dominant-baseline="middle" font-size="10" font-weight="bold" fill="green">Good</text>')
+    return "".join(parts)
 
-    plt.rcParams['axes.unicode_minus'] = False
+_svg_background: str | None = None
 
-    labels = [
-        f'주름\n({scores.wrinkles})',
-        f'모공\n({scores.pores})',
-        f'색소\n({scores.pigmentation})',
-        f'트러블\n({scores.acne})',
-        f'붉은기\n({scores.redness})',
-        f'탄력\n({scores.elasticity})',
-        f'수분\n({scores.hydration})'
-    ]
-    values = [
-        scores.wrinkles, scores.pores, scores.pigmentation, 
-        scores.acne, scores.redness, scores.elasticity,
-        scores.hydration
-    ]
-    
-    values += values[:1]
-    angles = np.linspace(0, 2 * np.pi, len(labels), endpoint=False).tolist()
-    angles += angles[:1]
+def create_radar_svg(scores: SkinScores) -> str:
+    """
+    레이더 차트를 SVG 문자열로 만듭니다.
+    래스터 렌더링/PNG 인코딩이 없어 PNG 차트보다 훨씬 빠르고 작습니다.
+    """
+    global _svg_background
+    if _svg_background is None:
+        _svg_background = _build_svg_background()
 
-    fig = plt.figure(figsize=(8, 8))
-    ax = fig.add_subplot(111, polar=True)
-    
-    ax.fill_between(angles, 0, 40, color='#FFDDDD', alpha=0.5)   
-    ax.fill_between(angles, 40, 70, color='#FFFEDD', alpha=0.5) 
-    ax.fill_between(angles, 70, 100, color='#DDFFDD', alpha=0.5) 
-    
-    ax.plot(angles, values, color='#FF007F', linewidth=2, linestyle='solid', label='내 피부 점수')
-    ax.fill(angles, values, color='#FF007F', alpha=0.2)
-    
-    ax.set_theta_offset(np.pi / 2)
-    ax.set_theta_direction(-1)
-    
-    ax.set_xticks(angles[:-1])
-    ax.set_xticklabels(labels, fontproperties=font_prop, size=11, weight='bold')
-    
-    for label in ax.get_xticklabels():
-        label.set_color('#333333')
-    
-    ax.set_rlabel_position(0)
-    plt.yticks([20, 40, 60, 80, 100], ["20", "40", "60", "80", "100"], color="grey", size=8)
-    plt.ylim(0, 100)
-    
-    ax.spines['polar'].set_visible(False)
-    ax.grid(True, color='grey', linestyle='--', alpha=0.5)
+    values = [getattr(scores, field) for field, _ in CHART_AXES]
+    points = _svg_polygon_points(values)
+    labels = []
+    for angle, (_, name), value in zip(_SVG_ANGLES, CHART_AXES, values):
+        x, y = _svg_point(angle, 118)
+        labels.append(f'<text x="{x:.1f}" y="{y:.1f}" text-anchor="middle">{name}<tspan x="{x:.1f}" dy="13">({value})</tspan></text>')
 
-    plt.figtext(0.5, 0.95, "바깥쪽으로 넓을수록 피부 상태가 좋습니다.", ha='center', 
-                fontproperties=font_prop, size=13, weight='bold', color='#000000')
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {SVG_SIZE} {SVG_SIZE + 20}" font-family="NanumGothic,sans-serif">'
+        f'{_svg_background}'
+        f'<polygon points="{points}" fill="#FF007F" fill-opacity=".2" stroke="#FF007F" stroke-width="2"/>'
+        f'<g font-size="11" font-weight="bold" fill="#333">{"".join(labels)}</g>'
+        f'<text x="{SVG_CENTER[0]}" y="{SVG_CENTER[1]}" text-anchor="middle" dominant-baseline="middle" font-size="10" font-weight="bold" fill="red" fill-opacity=".7">Bad</text>'
+        '</svg>'
+    )
 
-    ax.text(0, 0, "Bad", ha='center', va='center', color='red', weight='bold', size=10, alpha=0.7)
-    ax.text(np.radians(45), 110, "Good", ha='center', va='center', color='green', weight='bold', size=10)
+# 차트 응답 형식: png(base64 PNG, 기본값), svg(SVG 문자열), scores(차트 없이 점수만 전달 -> 클라이언트에서 렌더링)
+CHART_FORMATS = ("png", "svg", "scores")
 
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png', bbox_inches='tight', transparent=True)
-    plt.close(fig)
-    buf.seek(0)
-    
-    img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-    return img_base64
+def render_chart(scores: SkinScores, chart_format: str = "png") -> str | None:
+    if chart_format == "svg":
+        return create_radar_svg(scores)
+    if chart_format == "scores":
+        return None
+    return create_radar_chart(scores)
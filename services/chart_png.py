@@ -0,0 +1,191 @@
+"""
+matplotlib 기반 PNG 레이더 차트
+
+matplotlib/numpy는 불러오는 데 시간이 오래 걸리므로 services.chart에서 PNG 차트를 처음 만들 때 불러옵니다.
+"""
+import io
+import math
+import os
+import threading
+import numpy as np
+import matplotlib
+import matplotlib.font_manager as fm
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.transforms import Affine2D, Bbox, TransformedBbox
+from PIL import Image
+from schemas import SkinScores
+from services.chart import CHART_AXES
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FONT_PATH = os.path.join(BASE_DIR, "fonts", "NanumGothic-Bold.ttf")
+
+FIGSIZE = (8, 8)
+DPI = 100
+# savefig(bbox_inches='tight')의 기본 여백 (inch)
+PAD_INCHES = 0.1
+
+def _load_font() -> fm.FontProperties:
+    try:
+        return fm.FontProperties(fname=FONT_PATH)
+    except Exception:
+        return fm.FontProperties(family='Apple SD Gothic Neo')
+
+class RadarChartTemplate:
+    """
+    레이더 차트의 정적인 부분(배경 영역 띠, 안내 문구)을 한 번만 그려 두고,
+    요청마다 점수 영역/선과 그 위에 겹치는 격자·라벨만 다시 그리는 렌더러입니다.
+
+    savefig(bbox_inches='tight')는 그림 전체를 소수점 단위로 평행이동한 뒤 그리므로,
+    같은 픽셀 결과를 얻기 위해 템플릿마다 같은 소수점 이동량(offset)을 적용해 둡니다.
+    pyplot 전역 상태를 쓰지 않으므로 스레드에서 호출해도 안전합니다. (렌더링은 lock으로 직렬화)
+    """
+
+    def __init__(self, offset: tuple[float, float] = (0.0, 0.0)):
+        self._lock = threading.Lock()
+        font_prop = _load_font()
+        dx, dy = offset
+
+        with matplotlib.rc_context({'axes.unicode_minus': False}):
+            fig = Figure(figsize=FIGSIZE, dpi=DPI)
+            self.canvas = FigureCanvasAgg(fig)
+            # savefig(transparent=True)와 같은 효과
+            fig.patch.set_facecolor('none')
+            fig.patch.set_edgecolor('none')
+
+            ax = fig.add_subplot(111, polar=True)
+            ax.patch.set_facecolor('none')
+            ax.patch.set_edgecolor('none')
+            # 그림 전체를 (dx, dy) 픽셀만큼 왼쪽/아래로 이동
+            fig_w, fig_h = fig.bbox.width, fig.bbox.height
+            pos = ax.get_position()
+            ax.set_position([pos.x0 - dx / fig_w, pos.y0 - dy / fig_h, pos.width, pos.height])
+
+            self.angles = np.linspace(0, 2 * np.pi, len(CHART_AXES), endpoint=False).tolist()
+            closed_angles = self.angles + self.angles[:1]
+
+            ax.fill_between(closed_angles, 0, 40, color='#FFDDDD', alpha=0.5)
+            ax.fill_between(closed_angles, 40, 70, color='#FFFEDD', alpha=0.5)
+            ax.fill_between(closed_angles, 70, 100, color='#DDFFDD', alpha=0.5)
+
+            zeros = [0] * len(closed_angles)
+            self.line, = ax.plot(closed_angles, zeros, color='#FF007F', linewidth=2, linestyle='solid', label='내 피부 점수')
+            self.area, = ax.fill(closed_angles, zeros, color='#FF007F', alpha=0.2)
+
+            ax.set_theta_offset(np.pi / 2)
+            ax.set_theta_direction(-1)
+
+            ax.set_xticks(self.angles)
+            ax.set_xticklabels([name for _, name in CHART_AXES], fontproperties=font_prop, size=11, weight='bold')
+            for label in ax.get_xticklabels():
+                label.set_color('#333333')
+
+            ax.set_rlabel_position(0)
+            ax.set_yticks([20, 40, 60, 80, 100], ["20", "40", "60", "80", "100"], color="grey", size=8)
+            ax.set_ylim(0, 100)
+
+            ax.spines['polar'].set_visible(False)
+            ax.grid(True, color='grey', linestyle='--', alpha=0.5)
+
+            fig.text(0.5 - dx / fig_w, 0.95 - dy / fig_h, "바깥쪽으로 넓을수록 피부 상태가 좋습니다.", ha='center',
+                     fontproperties=font_prop, size=13, weight='bold', color='#000000')
+
+            self.bad_text = ax.text(0, 0, "Bad", ha='center', va='center', color='red', weight='bold', size=10, alpha=0.7)
+            ax.text(np.radians(45), 110, "Good", ha='center', va='center', color='green', weight='bold', size=10)
+
+        self.fig = fig
+        self.ax = ax
+
+        # 눈금/라벨 위치를 확정하기 위해 전체를 한 번 그림
+        self.canvas.draw()
+        renderer = self.canvas.get_renderer()
+        self.xtick_labels = [tick.label1 for tick in ax.xaxis.get_major_ticks()]
+
+        # 점수 라벨을 뺀 나머지 요소의 외곽 범위 (bbox_inches='tight' 계산용, pixel 단위)
+        for label in self.xtick_labels:
+            label.set_text('')
+        self.static_extent = fig.get_tightbbox(renderer).transformed(fig.dpi_scale_trans)
+
+        # 점수 영역과 겹칠 수 있는 요소(격자, 눈금 라벨, 점수 선, Bad)는 배경에서 빼고
+        # 요청마다 원래 그리던 순서대로 하나씩 다시 그림 (축 전체를 다시 그리는 것보다 훨씬 빠름)
+        # 안내 문구와 Good은 점수 영역 바깥에 있으므로 배경에 포함
+        self.area.set_animated(True)
+        self.overlay = []
+        for axis in (ax.xaxis, ax.yaxis):
+            axis.set_animated(True)
+            for tick in axis.get_major_ticks():
+                self.overlay += [tick.gridline, tick.tick1line, tick.tick2line, tick.label1, tick.label2]
+        for artist in (self.line, self.bad_text):
+            artist.set_animated(True)
+            self.overlay.append(artist)
+
+        # 배경만 그려서 저장
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(fig.bbox)
+
+    def set_labels(self, labels: list[str]) -> None:
+        for label, text in zip(self.xtick_labels, labels):
+            label.set_text(text)
+
+    def measure(self, labels: list[str]) -> Bbox:
+        """savefig(bbox_inches='tight')가 잘라낼 영역을 inch 단위로 계산합니다."""
+        with self._lock:
+            self.set_labels(labels)
+            renderer = self.canvas.get_renderer()
+            extent = Bbox.union([self.static_extent] + [label.get_window_extent(renderer) for label in self.xtick_labels])
+        return TransformedBbox(extent, Affine2D().scale(1 / DPI)).padded(PAD_INCHES)
+
+    def draw(self, values: list[int], labels: list[str]) -> np.ndarray:
+        """점수 영역/선과 라벨을 그린 전체 캔버스(RGBA)를 반환합니다."""
+        closed_values = values + values[:1]
+        closed_angles = self.angles + self.angles[:1]
+
+        with self._lock:
+            self.line.set_ydata(closed_values)
+            self.area.set_xy(np.column_stack([closed_angles, closed_values]))
+            self.set_labels(labels)
+
+            self.canvas.restore_region(self.background)
+            # 원래 그리던 순서: 점수 영역 -> 격자/눈금 라벨 -> 점수 선 -> Bad
+            renderer = self.canvas.get_renderer()
+            self.area.draw(renderer)
+            for artist in self.overlay:
+                artist.draw(renderer)
+
+            return np.asarray(self.canvas.buffer_rgba()).copy()
+
+_templates: dict[tuple[float, float], RadarChartTemplate] = {}
+_templates_lock = threading.Lock()
+
+def get_chart_template(offset: tuple[float, float] = (0.0, 0.0)) -> RadarChartTemplate:
+    """
+    소수점 이동량별 차트 템플릿을 최초 1회만 생성합니다.
+    라벨 폭에 따라 이동량이 몇 가지로만 나오므로 템플릿 수는 작게 유지됩니다.
+    (서버 시작 시 미리 호출해 두면 첫 요청이 빨라짐)
+    """
+    key = (round(offset[0], 6), round(offset[1], 6))
+    template = _templates.get(key)
+    if template is None:
+        with _templates_lock:
+            template = _templates.get(key)
+            if template is None:
+                template = _templates[key] = RadarChartTemplate(key)
+    return template
+
+def render_radar_chart_png(scores: SkinScores) -> bytes:
+    values = [getattr(scores, field) for field, _ in CHART_AXES]
+    labels = [f'{name}\n({value})' for (_, name), value in zip(CHART_AXES, values)]
+
+    # 1. 잘라낼 영역 계산 (savefig와 같은 방식: 시작점은 소수점, 크기는 버림)
+    bbox = get_chart_template().measure(labels)
+    x0, y0 = bbox.x0 * DPI, bbox.y0 * DPI
+    width, height = int(bbox.width * DPI), int(bbox.height * DPI)
+
+    # 2. 시작점의 소수 부분만큼 이동된 템플릿에 그리고, 정수 부분으로 잘라냄 (Agg 좌표는 아래쪽이 0)
+    pixels = get_chart_template((x0 - math.floor(x0), y0 - math.floor(y0))).draw(values, labels)
+    left = math.floor(x0)
+    top = pixels.shape[0] - math.floor(y0) - height
+
+    buf = io.BytesIO()
+    Image.fromarray(pixels[max(top, 0):top + height, max(left, 0):left + width]).save(buf, format='png')
+    return buf.getvalue()
@@ -0,0 +1,189 @@
+"""
+성분별 크롤링 상태와 적응형 동시 실행 수 (AIMD)
+
+- 성분마다 마지막 성공 시각, 연속 실패 수, 다음 시도 가능 시각을 기록하고
+  실패하면 지수 백오프 + 지터(CRAWL_BACKOFF_BASE_SECONDS * 2^(실패 수-1), 최대 CRAWL_BACKOFF_MAX_SECONDS)만큼 쉬었다가 다시 시도
+- 동시 크롤링 수는 1부터 시작해 목표 시간(CRAWL_TARGET_LATENCY_SECONDS) 안에 성공하면 조금씩 늘리고(+1/limit),
+  실패하거나 느려지면 절반으로 줄임 (최대 CRAWL_CONCURRENCY = 브라우저 페이지 풀 크기)
+상태는 GET /skin/crawl/status와 crawl_concurrency_limit / crawl_in_flight 메트릭으로 확인할 수 있습니다.
+"""
+import asyncio
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from config import settings
+from services.metrics import CRAWL_CONCURRENCY_LIMIT, CRAWL_IN_FLIGHT
+
+# 처리량 계산에 쓰는 최근 구간 (초)
+THROUGHPUT_WINDOW_SECONDS = 300.0
+# 지연 시간/오류율 지수 이동 평균 가중치
+EWMA_ALPHA = 0.3
+
+@dataclass
+class IngredientState:
+    name: str
+    status: str = "pending"  # pending / running / ok / failed
+    attempts: int = 0
+    failures: int = 0  # 연속 실패 수 (성공하면 0)
+    last_attempt_at: float | None = None
+    last_success_at: float | None = None
+    last_duration: float | None = None
+    last_error: str | None = None
+    next_eligible_at: float = 0.0
+
+class AdaptiveConcurrency:
+    """관측한 지연 시간과 실패에 따라 동시 실행 수를 조절하는 AIMD 제한기"""
+
+    def __init__(self, min_limit: int, max_limit: int, target_latency: float, decrease_factor: float = 0.5):
+        self.min_limit = min_limit
+        self.max_limit = max(min_limit, max_limit)
+        self.target_latency = target_latency
+        self.decrease_factor = decrease_factor
+        self.limit = float(min_limit)
+        self.in_flight = 0
+        self.latency_ewma: float | None = None
+        self.error_rate_ewma = 0.0
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+        CRAWL_CONCURRENCY_LIMIT.set(self.limit)
+
+    @asynccontextmanager
+    async def slot(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+            CRAWL_IN_FLIGHT.set(self.in_flight)
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self.in_flight -= 1
+                CRAWL_IN_FLIGHT.set(self.in_flight)
+                self._cond.notify_all()
+
+    def record(self, ok: bool, latency: float) -> None:
+        self.latency_ewma = latency if self.latency_ewma is None else EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.latency_ewma
+        self.error_rate_ewma = EWMA_ALPHA * (0.0 if ok else 1.0) + (1 - EWMA_ALPHA) * self.error_rate_ewma
+
+        if ok and latency <= self.target_latency:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        else:
+            # 동시에 실행 중이던 요청들이 한꺼번에 실패해도 한 번만 줄이도록 목표 시간에 한 번씩만 감소
+            now = time.monotonic()
+            if now - self._last_decrease >= self.target_latency:
+                self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                self._last_decrease = now
+        CRAWL_CONCURRENCY_LIMIT.set(round(self.limit, 2))
+
+class CrawlScheduler:
+    def __init__(self, base_backoff: float, max_backoff: float, limiter: AdaptiveConcurrency):
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.limiter = limiter
+        self.states: dict[str, IngredientState] = {}
+        self._completed: deque[float] = deque()
+        self.started_at: float | None = None
+
+    def state(self, name: str) -> IngredientState:
+        state = self.states.get(name)
+        if state is None:
+            state = self.states[name] = IngredientState(name=name)
+        return state
+
+    def is_eligible(self, name: str, now: float | None = None) -> bool:
+        """백오프 중이 아니면 True"""
+        return self.state(name).next_eligible_at <= (now or time.time())
+
+    def backoff_seconds(self, failures: int) -> float:
+        """지수 백오프의 절반은 고정, 나머지 절반은 무작위 (여러 성분이 같은 시각에 몰리지 않도록)"""
+        delay = min(self.max_backoff, self.base_backoff * 2 ** (failures - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    @asynccontextmanager
+    async def attempt(self, name: str):
+        """
+        성분 1개 크롤링 시도 (동시 실행 수 제한 안에서 실행)
+        yield한 dict의 "ok"를 True로 설정하면 성공으로 기록하고, 그 외(예외 포함)는 실패로 기록합니다.
+        """
+        state = self.state(name)
+        outcome = {"ok": False, "error": None}
+        async with self.limiter.slot():
+            if self.started_at is None:
+                self.started_at = time.time()
+            state.status = "running"
+            state.attempts += 1
+            state.last_attempt_at = time.time()
+            started = time.perf_counter()
+            try:
+                yield outcome
+            except BaseException as e:
+                outcome["error"] = repr(e)
+                raise
+            finally:
+                self._finish(state, outcome, time.perf_counter() - started)
+
+    def _finish(self, state: IngredientState, outcome: dict, elapsed: float) -> None:
+        now = time.time()
+        state.last_duration = round(elapsed, 3)
+        self.limiter.record(outcome["ok"], elapsed)
+        if outcome["ok"]:
+            state.status = "ok"
+            state.failures = 0
+            state.last_success_at = now
+            state.last_error = None
+            state.next_eligible_at = 0.0
+            self._completed.append(now)
+        else:
+            state.status = "failed"
+            state.failures += 1
+            state.last_error = outcome["error"] or "empty"
+            state.next_eligible_at = now + self.backoff_seconds(state.failures)
+
+    def next_eligible_in(self, names: list[str]) -> float:
+        """names 중 가장 먼저 다시 시도할 수 있는 성분까지 남은 시간 (초)"""
+        now = time.time()
+        return max(0.0, min((self.state(name).next_eligible_at for name in names), default=now) - now)
+
+    def throughput_per_minute(self) -> float:
+        now = time.time()
+        while self._completed and now - self._completed[0] > THROUGHPUT_WINDOW_SECONDS:
+            self._completed.popleft()
+        if not self._completed or self.started_at is None:
+            return 0.0
+        window = min(THROUGHPUT_WINDOW_SECONDS, now - self.started_at)
+        return round(len(self._completed) / window * 60, 2) if window > 0 else 0.0
+
+    def get_status(self) -> dict:
+        now = time.time()
+        limiter = self.limiter
+        return {
+            "started_at": self.started_at,
+            "concurrency": {
+                "limit": round(limiter.limit, 2),
+                "min": limiter.min_limit,
+                "max": limiter.max_limit,
+                "in_flight": limiter.in_flight,
+                "latency_ewma_seconds": round(limiter.latency_ewma, 3) if limiter.latency_ewma is not None else None,
+                "error_rate_ewma": round(limiter.error_rate_ewma, 3),
+            },
+            "throughput_per_minute": self.throughput_per_minute(),
+            "ingredients": {
+                name: {
+                    **asdict(state),
+                    "backoff_remaining_seconds": round(max(0.0, state.next_eligible_at - now), 1),
+                }
+                for name, state in self.states.items()
+            },
+        }
+
+crawl_scheduler = CrawlScheduler(
+    base_backoff=settings.CRAWL_BACKOFF_BASE_SECONDS,
+    max_backoff=settings.CRAWL_BACKOFF_MAX_SECONDS,
+    limiter=AdaptiveConcurrency(
+        min_limit=1,
+        max_limit=settings.CRAWL_CONCURRENCY,
+        target_latency=settings.CRAWL_TARGET_LATENCY_SECONDS,
+    ),
+)
@@ -1,74 +1,220 @@
 import asyncio
+import time
+from collections import Counter
+from config import settings
 from crawler import crawl_oliveyoung_products
 from ingredient_recommendation import load_ingredients
+from services.browser import browser_manager
+from services.cache import create_cache
+from services.crawl_scheduler import crawl_scheduler
+from services.leader import leader
+from services.metrics import CACHE_REQUESTS, CRAWL_DURATION, CRAWL_RESULTS
+from services.singleflight import SingleFlight
 
-# 전역 변수로 캐시 저장소 정의 (main.py에서 이동)
-PRODUCT_CACHE = {}
+# 성분명 -> 제품 목록 캐시
+# sqlite 백엔드는 재시작 후에도 유지되고 여러 워커가 같은 파일을 공유하므로, 부팅 직후 첫 요청부터 제품을 반환할 수 있음
+# PRODUCT_CACHE_TTL_SECONDS가 지난 항목은 stale로 보고 계속 응답하면서 백그라운드에서 갱신하며,
+# PRODUCT_CACHE_MAX_STALE_SECONDS가 지나면 삭제됨
+PRODUCT_CACHE = create_cache(
+    settings.PRODUCT_CACHE_BACKEND,
+    table="products",
+    path=settings.CACHE_DB_PATH,
+    ttl_seconds=settings.PRODUCT_CACHE_MAX_STALE_SECONDS,
+)
+
+# 부팅 크롤링과 갱신이 겹쳐도 같은 성분은 한 번만 크롤링
+crawl_flight = SingleFlight("crawl")
+
+# 갱신 우선순위를 정하기 위한 성분별 조회 수
+_request_counts: Counter[str] = Counter()
+# 갱신 중인 성분 (같은 성분을 중복 크롤링하지 않도록)
+_refreshing: set[str] = set()
+# 갱신 태스크 참조 (가비지 컬렉션 방지)
+_refresh_tasks: set[asyncio.Task] = set()
+# 갱신 크롤링 동시 실행 수 제한 (진단 요청 처리와 자원을 다투지 않도록)
+_refresh_semaphore = asyncio.Semaphore(settings.CRAWL_REFRESH_CONCURRENCY)
 
 async def background_crawling_task():
+    """
+    캐시에 제품이 없는 성분을 크롤링합니다. (캐시에 남아 있는 성분은 stale이어도 건너뜀)
+    실패한 성분은 성분별 백오프가 끝나는 대로 다시 시도하고, 동시 실행 수는 crawl_scheduler가 조절합니다.
+    """
     print("백그라운드: 성분 데이터 크롤링을 시작합니다...")
-    ingredients = load_ingredients()
-    
-    # 동시 실행 제한 (한 번에 1개씩 순차 진행)
-    semaphore = asyncio.Semaphore(1)
-
-    async def sem_task(ing_name):
-        async with semaphore:
-            return await crawl_oliveyoung_products(ing_name)
-    
+    names = [ing["name_ko"] for ing in load_ingredients()]
+
+    def needs_crawl(name: str) -> bool:
+        return PRODUCT_CACHE.get(name) is None
+
+    cached_count = sum(1 for name in names if not needs_crawl(name))
+    if cached_count:
+        print(f"캐시에 저장된 성분 {cached_count}/{len(names)}개는 크롤링을 건너뜁니다.")
+
+    started = time.perf_counter()
+    running: dict[str, asyncio.Task] = {}
     while True:
-        # 아직 캐싱되지 않은(또는 실패해서 결과가 없는) 성분 식별
-        target_ingredients = [
-            ing for ing in ingredients 
-            if ing["name_ko"] not in PRODUCT_CACHE or not PRODUCT_CACHE[ing["name_ko"]]
-        ]
-
-        if not target_ingredients:
-            print("서버 시작 후 진행 중인 크롤링이 종료되었습니다. (실패 항목이 있다면 재시도 예정)")
+        # 아직 캐싱되지 않은(또는 실패해서 결과가 없는) 성분 중 백오프가 끝난 성분을 시작
+        # 한 성분이 오래 걸려도 다른 성분은 자리가 나는 대로 진행됨
+        pending = [name for name in names if needs_crawl(name)]
+        if not pending and not running:
             break
+        for name in pending:
+            if name not in running and crawl_scheduler.is_eligible(name):
+                running[name] = asyncio.create_task(crawl_and_store(name))
 
-        print(f"크롤링 대상 성분: {[ing['name_ko'] for ing in target_ingredients]}")
-
-        # 크롤링 태스크 생성 (남은 성분들만)
-        tasks = [sem_task(ing["name_ko"]) for ing in target_ingredients]
-        results = await asyncio.gather(*tasks)
-        
-        # 결과를 캐시에 저장 (성공한 것만 저장됨, 실패하면 빈 리스트일 수 있음)
-        success_count = 0
-        for ing, products in zip(target_ingredients, results):
-            if products: # 결과가 있을 때만 저장하고 성공으로 간주
-                PRODUCT_CACHE[ing["name_ko"]] = products
-                success_count += 1
-            else:
-                pass
-            
-        print(f"이번 시도 성공: {success_count}/{len(target_ingredients)}")
-
-        # 여전히 남은(실패한) 성분이 있는지 확인
-        remaining = [
-            ing for ing in ingredients 
-            if ing["name_ko"] not in PRODUCT_CACHE or not PRODUCT_CACHE[ing["name_ko"]]
-        ]
-
-        if remaining:
-            print(f"크롤링 실패(또는 빈 결과) 성분 {len(remaining)}개 발견. 60초 후 재시도합니다...")
-            await asyncio.sleep(60)
+        # 진행 중인 크롤링이 끝나거나 백오프 중인 성분의 재시도 시각이 될 때까지 대기
+        waiting = [name for name in pending if name not in running]
+        timeout = crawl_scheduler.next_eligible_in(waiting) if waiting else None
+        if running:
+            done, _ = await asyncio.wait(running.values(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for name in [name for name, task in running.items() if task in done]:
+                running.pop(name)
         else:
-            print("백그라운드 크롤링 최종 완료: 모든 성분의 제품 정보를 캐싱했습니다.")
-            break
+            print(f"크롤링 실패(또는 빈 결과) 성분 {len(waiting)}개: {timeout:.0f}초 후 재시도합니다...")
+            await asyncio.sleep(timeout)
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"백그라운드 크롤링 최종 완료: 모든 성분의 제품 정보를 캐싱했습니다. "
+        f"({elapsed:.1f}초, 분당 {crawl_scheduler.throughput_per_minute():.1f}개 처리)"
+    )
+
+async def crawl_and_store(ingredient_name: str) -> bool:
+    """한 성분을 크롤링해 결과가 있으면 캐시에 저장합니다."""
+    products = await crawl_products(ingredient_name)
+    if not products:
+        return False
+    PRODUCT_CACHE.set(ingredient_name, products)
+    return True
+
+async def crawl_products(ingredient_name: str) -> list[dict]:
+    """같은 성분의 크롤링이 이미 진행 중이면 새로 시작하지 않고 그 결과를 함께 기다립니다."""
+    return await crawl_flight.do(ingredient_name, lambda: _timed_crawl(ingredient_name))
+
+async def _timed_crawl(ingredient_name: str) -> list[dict]:
+    """
+    동시 실행 수 제한 안에서 크롤링하고 결과를 성분별 상태에 기록합니다.
+    시도 하나가 CRAWL_ATTEMPT_TIMEOUT_SECONDS를 넘기면 취소해 다른 성분이 막히지 않도록 함 (타임아웃/오류는 빈 결과)
+    """
+    async with crawl_scheduler.attempt(ingredient_name) as outcome:
+        started = time.perf_counter()
+        try:
+            products = await asyncio.wait_for(
+                crawl_oliveyoung_products(ingredient_name), settings.CRAWL_ATTEMPT_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            CRAWL_RESULTS.inc(result="timeout")
+            outcome["error"] = f"timeout ({settings.CRAWL_ATTEMPT_TIMEOUT_SECONDS:.0f}s)"
+            print(f"크롤링 제한 시간 초과: {ingredient_name}")
+            return []
+        except Exception as e:
+            CRAWL_RESULTS.inc(result="error")
+            outcome["error"] = repr(e)
+            print(f"크롤링 실패 ({ingredient_name}): {e!r}")
+            return []
+        finally:
+            CRAWL_DURATION.observe(time.perf_counter() - started)
+        CRAWL_RESULTS.inc(result="success" if products else "empty")
+        outcome["ok"] = bool(products)
+        return products
 
 def get_cached_products(ingredient_name: str) -> list[dict]:
-    return PRODUCT_CACHE.get(ingredient_name, [])
+    """
+    캐시된 제품 목록을 반환합니다.
+    stale 항목도 그대로 반환하되, 이벤트 루프 안에서 호출되면 해당 성분의 백그라운드 갱신을 예약합니다.
+    """
+    _request_counts[ingredient_name] += 1
+    entry = PRODUCT_CACHE.get_entry(ingredient_name)
+    if entry is None:
+        CACHE_REQUESTS.inc(cache="products", result="miss")
+        return []
+
+    products, stored_at = entry
+    if _is_stale(stored_at):
+        CACHE_REQUESTS.inc(cache="products", result="stale")
+        _schedule_refresh(ingredient_name)
+    else:
+        CACHE_REQUESTS.inc(cache="products", result="hit")
+    return products or []
+
+def _is_stale(stored_at: float) -> bool:
+    return time.time() - stored_at > settings.PRODUCT_CACHE_TTL_SECONDS
+
+def _schedule_refresh(ingredient_name: str) -> None:
+    # 크롤링은 리더 워커만 실행 (팔로워는 공유 캐시의 stale 값으로 응답하고 갱신은 리더에 맡김)
+    # 최근 실패해 백오프 중인 성분은 요청이 들어와도 다시 크롤링하지 않음
+    if ingredient_name in _refreshing or not leader.is_leader or not crawl_scheduler.is_eligible(ingredient_name):
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(refresh_ingredient(ingredient_name))
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
 
-def clear_cache():
-    PRODUCT_CACHE.clear()
-    print("서버 종료: 캐시를 비웠습니다.")
+async def refresh_ingredient(ingredient_name: str) -> bool:
+    """
+    한 성분을 다시 크롤링해 캐시 항목을 통째로 교체합니다.
+    크롤링에 실패하면 기존 항목을 그대로 두고 False를 반환합니다.
+    """
+    if ingredient_name in _refreshing:
+        return False
+    _refreshing.add(ingredient_name)
+    try:
+        async with _refresh_semaphore:
+            stored = await crawl_and_store(ingredient_name)
+        if not stored:
+            print(f"[갱신] {ingredient_name} 크롤링 실패: 기존 제품 정보를 유지합니다.")
+        return stored
+    finally:
+        _refreshing.discard(ingredient_name)
+
+def _refresh_priority(ingredient_name: str) -> tuple:
+    """캐시에 없는 성분 -> stale 성분 -> 조회가 많은 성분 -> 오래된 성분 순서"""
+    entry = PRODUCT_CACHE.get_entry(ingredient_name)
+    if entry is None:
+        return (0, 0, 0.0)
+    stored_at = entry[1]
+    return (1 if _is_stale(stored_at) else 2, -_request_counts[ingredient_name], stored_at)
 
 async def refresh_crawling_data():
-    """자정마다 호출되어 캐시를 비우고 데이터를 새로고침하는 함수"""
+    """
+    자정마다 호출되어 모든 성분의 제품 데이터를 새로고침하는 함수
+    갱신 중에도 기존 캐시로 응답하고, 성분별로 새 결과가 나오는 즉시 교체합니다.
+    """
     print("[스케줄러] 자정 데이터 갱신 작업 시작")
-    clear_cache()
-    
-    # background_crawling_task는 비동기 함수이므로 await로 실행 기다림
-    await background_crawling_task()
-    print("[스케줄러] 자정 데이터 갱신 작업 완료")
+    started = time.perf_counter()
+
+    names = sorted((ing["name_ko"] for ing in load_ingredients()), key=_refresh_priority)
+    results = await asyncio.gather(*(refresh_ingredient(name) for name in names))
+
+    print(
+        f"[스케줄러] 자정 데이터 갱신 작업 완료: {sum(results)}/{len(names)}개 갱신 "
+        f"({time.perf_counter() - started:.1f}초)"
+    )
+
+def get_crawl_status() -> dict:
+    """성분별 크롤링 상태, 동시 실행 수, 처리량, 브라우저 페이지 풀 통계와 캐시 보유 현황 (GET /skin/crawl/status)"""
+    status = crawl_scheduler.get_status()
+    now = time.time()
+    names = [ing["name_ko"] for ing in load_ingredients()]
+    cached = fresh = 0
+    for name in names:
+        entry = PRODUCT_CACHE.get_entry(name)
+        info = status["ingredients"].setdefault(name, {"name": name, "status": "pending"})
+        info["cached"] = entry is not None
+        info["cache_age_seconds"] = round(now - entry[1], 1) if entry is not None else None
+        if entry is not None:
+            cached += 1
+            fresh += not _is_stale(entry[1])
+    return {
+        "is_leader": leader.is_leader,
+        "total": len(names),
+        "cached": cached,
+        "fresh": fresh,
+        "in_backoff": sum(1 for info in status["ingredients"].values() if info.get("backoff_remaining_seconds")),
+        "refreshing": sorted(_refreshing),
+        **status,
+        # 브라우저 시작 횟수, 처리한 페이지 수, 실패 수, 페이지당 평균 시간 (Playwright로 크롤링한 경우만)
+        "browser": browser_manager.get_stats(),
+    }
@@ -0,0 +1,294 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import settings
+from ingredient_recommendation import get_ingredient_recommendations
+from schemas import (
+    AnalysisResponse, GeminiAnalysisResult, GeminiMultiAnalysisResult, GeminiRegionResult, IngredientRecommendation,
+    MultiAnalysisResponse, RegionScores, SkinScores,
+)
+from services.analysis import (
+    AnalysisBusyError, AnalysisTimeoutError, analysis_flight, analyze_image_with_gemini, analyze_images_with_gemini,
+)
+from services.chart import render_chart
+from services.crawling import get_cached_products
+from services.metrics import record_stage, stage_timer
+from services.prescreen import record_avoided_call
+from services.preprocess import ImageTooLargeError, InvalidImageError, PreprocessedImage, preprocess_image
+from services.result_cache import get_cached_result, make_cache_key, make_multi_cache_key, set_cached_result
+
+logger = logging.getLogger(__name__)
+
+# 차트 렌더링 전용 스레드풀
+# 기본 스레드풀(asyncio.to_thread)과 분리해 차트 CPU 작업이 업로드 전처리 등 다른 작업을 밀어내지 않도록 함
+# (services.chart는 pyplot 전역 상태를 쓰지 않고 템플릿마다 lock을 걸어 스레드에서 안전함)
+_chart_executor = ThreadPoolExecutor(max_workers=settings.CHART_MAX_WORKERS, thread_name_prefix="chart")
+
+def needs_chart(result: GeminiAnalysisResult, chart_format: str) -> bool:
+    return result.is_skin and result.total_score > 0 and chart_format != "scores"
+
+def needs_recommendations(result: GeminiAnalysisResult) -> bool:
+    return result.is_skin and result.total_score > 0
+
+async def render_chart_within_budget(scores: SkinScores, chart_format: str) -> str | None:
+    """
+    차트를 스레드풀에서 렌더링합니다.
+    CHART_BUDGET_SECONDS 안에 끝나지 않으면 None을 반환합니다. (아직 시작하지 않은 작업은 취소됨)
+    """
+    if chart_format == "scores":
+        return None
+
+    started = time.perf_counter()
+    future = asyncio.get_running_loop().run_in_executor(_chart_executor, render_chart, scores, chart_format)
+    try:
+        return await asyncio.wait_for(future, settings.CHART_BUDGET_SECONDS)
+    except asyncio.TimeoutError:
+        logger.warning(f"차트 렌더링 시간 초과 ({time.perf_counter() - started:.2f}s): 차트 없이 응답합니다.")
+        return None
+    finally:
+        record_stage("chart", time.perf_counter() - started)
+
+async def recommend_within_budget(scores: SkinScores, priorities: list[str]) -> list[IngredientRecommendation]:
+    """성분을 추천합니다. RECOMMEND_BUDGET_SECONDS 안에 끝나지 않으면 빈 목록을 반환합니다."""
+    try:
+        with stage_timer("recommend"):
+            return await asyncio.wait_for(
+                asyncio.to_thread(get_ingredient_recommendations, scores, priorities),
+                settings.RECOMMEND_BUDGET_SECONDS,
+            )
+    except asyncio.TimeoutError:
+        logger.warning("성분 추천 시간 초과: 추천 없이 응답합니다.")
+        return []
+
+def attach_products(recommended_ingredients: list[IngredientRecommendation]) -> None:
+    """
+    추천 성분에 캐시된 제품 정보를 연결합니다.
+    stale 항목의 갱신 예약에 이벤트 루프가 필요하므로 스레드가 아닌 이벤트 루프에서 호출하세요.
+    """
+    with stage_timer("products"):
+        for ing in recommended_ingredients:
+            cached_products = get_cached_products(ing.name_ko)
+            if cached_products:
+                ing.products = cached_products
+            else:
+                print(f"Warning: Cache miss for ingredient {ing.name_ko}")
+                ing.products = []
+
+async def recommend_with_products(scores: SkinScores, priorities: list[str]) -> list[IngredientRecommendation]:
+    recommended_ingredients = await recommend_within_budget(scores, priorities)
+    attach_products(recommended_ingredients)
+    return recommended_ingredients
+
+# 사전 판별에서 걸러진 사진의 응답 (Gemini가 피부 사진이 아니라고 판단했을 때와 같은 내용)
+NOT_SKIN_DIAGNOSIS = "피부 사진이 아닙니다."
+NOT_SKIN_RECOMMENDATION = "정확한 분석을 위해 피부가 잘 보이도록 밝은 곳에서 가까이 촬영해 주세요."
+
+def not_skin_result() -> GeminiAnalysisResult:
+    return GeminiAnalysisResult(
+        is_skin=False,
+        scores=SkinScores(**{field: 0 for field in SkinScores.model_fields}),
+        total_score=0,
+        priorities=[],
+        diagnosis=NOT_SKIN_DIAGNOSIS,
+        recommendation=NOT_SKIN_RECOMMENDATION,
+    )
+
+def is_prescreen_rejected(processed: PreprocessedImage, record: bool = True) -> bool:
+    """
+    사전 판별에서 확실히 피부 사진이 아니라고 나오면 Gemini 호출을 건너뜁니다.
+    record=False이면 건너뛴 호출 수는 세지 않음 (여러 장 중 일부만 걸러져 호출은 하는 경우)
+    """
+    if processed.prescreen is None or not processed.prescreen.rejected:
+        return False
+    logger.info(f"사전 판별에서 걸러짐 ({processed.prescreen.reason}): {processed.prescreen.metrics}")
+    if record:
+        record_avoided_call(processed.prescreen.reason)
+    return True
+
+async def analyze(contents: bytes, concern: str | None, cache_key: str) -> GeminiAnalysisResult:
+    """
+    이미지 전처리 (회전 보정/축소/재인코딩) 후 Gemini로 분석합니다.
+    같은 사진이 동시에 여러 번 들어오면 분석은 한 번만 하고 결과를 함께 사용합니다.
+    """
+    async def run():
+        with stage_timer("preprocess"):
+            processed = await asyncio.to_thread(preprocess_image, contents)
+        if is_prescreen_rejected(processed):
+            return not_skin_result()
+        return await analyze_image_with_gemini(processed.data, processed.mime_type, concern)
+
+    return await analysis_flight.do(cache_key, run)
+
+async def get_cached_response(
+    cache_key: str, chart_format: str, response_model: type[AnalysisResponse] = AnalysisResponse
+) -> AnalysisResponse | None:
+    """
+    같은 사진 + 같은 코멘트로 분석한 결과가 있으면 반환합니다.
+    다른 형식으로 요청했거나 이전에 차트가 시간 초과로 빠진 경우 Gemini 재호출 없이 차트만 다시 만들고,
+    성분 추천이 시간 초과로 빠진 경우에도 추천만 다시 만듭니다. (빈 추천이 결과 캐시 TTL 동안 남지 않도록)
+    제품 목록은 결과 캐시에 저장하지 않으므로 매번 제품 캐시에서 다시 연결합니다. (stale 항목 갱신 예약 포함)
+    """
+    with stage_timer("cache"):
+        cached = get_cached_result(cache_key, response_model)
+    if not cached:
+        return None
+
+    cached_result, cached_response = cached
+    updated = False
+    if needs_recommendations(cached_result) and not cached_response.recommended_ingredients:
+        cached_response.recommended_ingredients = await recommend_within_budget(cached_result.scores, cached_result.priorities)
+        updated = bool(cached_response.recommended_ingredients)
+
+    chart_missing = needs_chart(cached_result, chart_format) and cached_response.graph_image is None
+    if cached_response.graph_format != chart_format or chart_missing:
+        cached_response.graph_image = None
+        if needs_chart(cached_result, chart_format):
+            cached_response.graph_image = await render_chart_within_budget(cached_result.scores, chart_format)
+        cached_response.graph_format = chart_format
+        updated = True
+
+    if updated:
+        set_cached_result(cache_key, cached_result, cached_response)
+    attach_products(cached_response.recommended_ingredients)
+    return cached_response
+
+def make_response(
+    result: GeminiAnalysisResult,
+    recommended_ingredients: list[IngredientRecommendation],
+    graph_image: str | None,
+    chart_format: str,
+) -> AnalysisResponse:
+    return AnalysisResponse(
+        is_skin=result.is_skin,
+        diagnosis=result.diagnosis,
+        recommendation=result.recommendation,
+        scores=result.scores if result.is_skin else None,
+        priorities=result.priorities,
+        recommended_ingredients=recommended_ingredients,
+        graph_image=graph_image,
+        graph_format=chart_format
+    )
+
+async def build_diagnosis_response(result: GeminiAnalysisResult, chart_format: str) -> AnalysisResponse:
+    """분석 결과로 응답을 만듭니다. 차트 렌더링과 성분/제품 추천을 동시에 진행합니다."""
+    graph_image = None
+    recommended_ingredients = []
+
+    if needs_recommendations(result):
+        graph_image, recommended_ingredients = await asyncio.gather(
+            render_chart_within_budget(result.scores, chart_format),
+            recommend_with_products(result.scores, result.priorities),
+        )
+
+    return make_response(result, recommended_ingredients, graph_image, chart_format)
+
+async def diagnose(contents: bytes, concern: str | None, chart_format: str) -> AnalysisResponse:
+    """업로드 이미지 한 장의 진단 전체 과정 (결과 캐시 확인 -> 분석 -> 차트/추천 -> 결과 캐시 저장)"""
+    cache_key = make_cache_key(contents, concern)
+    cached_response = await get_cached_response(cache_key, chart_format)
+    if cached_response:
+        return cached_response
+
+    result = await analyze(contents, concern, cache_key)
+    # 차트가 제한 시간을 넘기면 graph_image 없이 나머지 결과만 응답
+    response = await build_diagnosis_response(result, chart_format)
+    set_cached_result(cache_key, result, response)
+    return response
+
+def combine_region_results(
+    multi: GeminiMultiAnalysisResult, regions: list[str]
+) -> tuple[GeminiAnalysisResult, list[RegionScores]]:
+    """
+    사진별 점수를 한 장 진단과 같은 형태의 결과로 합칩니다.
+    피부 사진으로 판별된 부위의 항목별 평균을 점수로 쓰고, 우선순위는 합친 점수가 낮은 순서입니다.
+    응답의 부위 이름은 모델이 돌려준 값 대신 요청 순서의 이름을 사용합니다.
+    """
+    region_scores = []
+    skin_scores = []
+    for i, region in enumerate(regions):
+        item = multi.regions[i] if i < len(multi.regions) else None
+        is_skin = bool(item and item.is_skin)
+        region_scores.append(RegionScores(region=region, is_skin=is_skin, scores=item.scores if is_skin else None))
+        if is_skin:
+            skin_scores.append(item.scores.model_dump())
+
+    fields = list(SkinScores.model_fields)
+    if skin_scores:
+        combined = {f: round(sum(s[f] for s in skin_scores) / len(skin_scores)) for f in fields}
+        total_score = round(sum(combined.values()) / len(fields))
+        priorities = sorted(fields, key=lambda f: combined[f])
+    else:
+        combined = {f: 0 for f in fields}
+        total_score = 0
+        priorities = []
+
+    result = GeminiAnalysisResult(
+        is_skin=bool(skin_scores),
+        scores=SkinScores(**combined),
+        total_score=total_score,
+        priorities=priorities,
+        diagnosis=multi.diagnosis,
+        recommendation=multi.recommendation,
+    )
+    return result, region_scores
+
+async def analyze_multi(
+    images: list[bytes], regions: list[str], concern: str | None, cache_key: str
+) -> tuple[GeminiAnalysisResult, list[RegionScores]]:
+    """여러 장을 동시에 전처리한 뒤 Gemini 호출 한 번으로 분석하고 부위별 점수를 합칩니다."""
+    async def run():
+        with stage_timer("preprocess"):
+            processed = await asyncio.gather(*(asyncio.to_thread(preprocess_image, image) for image in images))
+
+        # 사전 판별에서 걸러진 사진은 빼고 보내고, 결과에는 피부 사진 아님으로 채움
+        passed = [i for i, p in enumerate(processed) if not is_prescreen_rejected(p, record=False)]
+        if not passed:
+            record_avoided_call(processed[0].prescreen.reason)
+            return combine_region_results(
+                GeminiMultiAnalysisResult(regions=[], diagnosis=NOT_SKIN_DIAGNOSIS, recommendation=NOT_SKIN_RECOMMENDATION),
+                regions,
+            )
+        multi = await analyze_images_with_gemini(
+            [(processed[i].data, processed[i].mime_type) for i in passed], [regions[i] for i in passed], concern
+        )
+        by_index = dict(zip(passed, multi.regions))
+        not_skin = not_skin_result()
+        multi.regions = [
+            by_index.get(i) or GeminiRegionResult(region=region, is_skin=False, scores=not_skin.scores)
+            for i, region in enumerate(regions)
+        ]
+        return combine_region_results(multi, regions)
+
+    return await analysis_flight.do(cache_key, run)
+
+async def diagnose_multi(
+    images: list[bytes], regions: list[str], concern: str | None, chart_format: str
+) -> MultiAnalysisResponse:
+    """여러 부위 사진의 진단 전체 과정. 차트와 성분/제품 추천은 합친 점수로 한 번만 만듭니다."""
+    cache_key = make_multi_cache_key(images, regions, concern)
+    cached_response = await get_cached_response(cache_key, chart_format, MultiAnalysisResponse)
+    if cached_response:
+        return cached_response
+
+    result, region_scores = await analyze_multi(images, regions, concern, cache_key)
+    response = await build_diagnosis_response(result, chart_format)
+    response = MultiAnalysisResponse(**response.model_dump(), regions=region_scores)
+    set_cached_result(cache_key, result, response)
+    return response
+
+def describe_error(e: Exception) -> tuple[int, str]:
+    """진단 중 발생한 예외를 /skin/diagnosis가 응답하는 (HTTP 상태 코드, 메시지)로 변환합니다."""
+    if isinstance(e, ImageTooLargeError):
+        return 413, str(e)
+    if isinstance(e, InvalidImageError):
+        return 400, str(e)
+    if isinstance(e, AnalysisBusyError):
+        return 429, str(e)
+    print(f"Error: {e}")
+    if isinstance(e, AnalysisTimeoutError):
+        return 504, "피부 분석 시간 초과"
+    return 500, "피부 분석 실패"
+
+def shutdown_chart_executor() -> None:
+    _chart_executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from config import settings
+from schemas import AnalysisResponse, DiagnosisJob, DiagnosisJobError
+from services.admission import admission
+from services.cache import MemoryCache
+from services.diagnosis import describe_error, diagnose
+from services.metrics import JOB_QUEUE_DEPTH, JOB_RUNNING, JOB_WAIT
+
+logger = logging.getLogger(__name__)
+
+class JobQueueFullError(Exception):
+    """진단 작업 대기열이 가득 찼을 때 발생합니다."""
+
+@dataclass
+class _Job:
+    id: str
+    seq: int
+    contents: bytes | None
+    concern: str | None
+    chart_format: str
+    status: str = "queued"
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    result: AnalysisResponse | None = None
+    error: DiagnosisJobError | None = None
+
+class DiagnosisJobQueue:
+    """
+    진단 요청을 작업으로 받아 백그라운드 워커가 처리하는 대기열입니다.
+    - 대기열 크기는 max_queue로 제한 (가득 차면 JobQueueFullError)
+    - workers개의 워커가 순서대로 꺼내 /skin/diagnosis와 같은 과정(diagnose)을 실행
+      (HTTP 진단 요청과 같은 전체 동시 분석 자리(ADMISSION_MAX_IN_FLIGHT)를 얻은 뒤 실행)
+    - 끝난 작업은 완료 시점부터 result_ttl_seconds 동안 조회 가능 (아무도 조회하지 않은 작업도 제출/완료 시 정리)
+    """
+
+    def __init__(self, workers: int, max_queue: int, result_ttl_seconds: float):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._queue: asyncio.Queue[_Job] = asyncio.Queue(maxsize=max_queue)
+        # 대기/실행 중인 작업은 만료되지 않도록 따로 보관하고, 끝나면 TTL 캐시로 옮김
+        self._pending: dict[str, _Job] = {}
+        self._jobs = MemoryCache(ttl_seconds=result_ttl_seconds)
+        self._tasks: list[asyncio.Task] = []
+        self._submitted = 0
+        self._dequeued = 0
+        self._running = 0
+        self._total_wait = 0.0
+
+    def submit(self, contents: bytes, concern: str | None, chart_format: str) -> _Job:
+        # 조회되지 않고 만료된 작업(차트 포함 결과)이 메모리에 계속 남지 않도록 정리
+        self._jobs.purge_expired()
+        job = _Job(id=uuid.uuid4().hex, seq=self._submitted, contents=contents, concern=concern, chart_format=chart_format)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise JobQueueFullError("진단 요청이 많아 잠시 후 다시 시도해 주세요.") from None
+        self._submitted += 1
+        self._pending[job.id] = job
+        JOB_QUEUE_DEPTH.set(self._queue.qsize())
+        return job
+
+    def get(self, job_id: str) -> _Job | None:
+        return self._pending.get(job_id) or self._jobs.get(job_id)
+
+    def to_schema(self, job: _Job) -> DiagnosisJob:
+        wait_seconds = None
+        if job.started_at:
+            wait_seconds = round((job.started_at - job.created_at).total_seconds(), 3)
+        return DiagnosisJob(
+            job_id=job.id,
+            status=job.status,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+            queue_position=job.seq - self._dequeued if job.status == "queued" else None,
+            wait_seconds=wait_seconds,
+            result=job.result,
+            error=job.error,
+        )
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            self._dequeued += 1
+            self._running += 1
+            JOB_QUEUE_DEPTH.set(self._queue.qsize())
+            JOB_RUNNING.set(self._running)
+
+            job.status = "running"
+            job.started_at = datetime.now(timezone.utc)
+            wait = (job.started_at - job.created_at).total_seconds()
+            self._total_wait += wait
+            JOB_WAIT.observe(wait)
+            try:
+                async with admission.slot():
+                    job.result = await diagnose(job.contents, job.concern, job.chart_format)
+                job.status = "succeeded"
+            except Exception as e:
+                status, detail = describe_error(e)
+                job.error = DiagnosisJobError(status=status, detail=detail)
+                job.status = "failed"
+            finally:
+                job.finished_at = datetime.now(timezone.utc)
+                # 업로드 원본은 더 이상 필요 없으므로 메모리에서 해제
+                job.contents = None
+                self._jobs.set(job.id, job)
+                self._pending.pop(job.id, None)
+                self._jobs.purge_expired()
+                self._running -= 1
+                JOB_RUNNING.set(self._running)
+                self._queue.task_done()
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+            logger.info(f"진단 작업 워커 {self.workers}개 시작")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def get_stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize(),
+            "max_queue": self.max_queue,
+            "running": self._running,
+            "submitted": self._submitted,
+            "avg_wait_seconds": round(self._total_wait / self._dequeued, 3) if self._dequeued else 0.0,
+        }
+
+job_queue = DiagnosisJobQueue(
+    workers=settings.JOB_WORKERS,
+    max_queue=settings.JOB_QUEUE_MAX,
+    result_ttl_seconds=settings.JOB_RESULT_TTL_SECONDS,
+)
@@ -0,0 +1,127 @@
+"""
+여러 워커 중 하나만 크롤링/스케줄러 작업을 실행하도록 리더를 선출합니다.
+
+uvicorn --workers N으로 실행하면 워커마다 lifespan이 실행되므로, 같은 호스트의 워커끼리 잠금 파일(fcntl.flock)로
+리더를 정합니다. 잠금을 잡은 워커만 백그라운드 크롤링, 자정 갱신, keep-alive 작업을 실행하고
+결과는 공유 저장소(sqlite 제품 캐시)에 저장해 다른 워커가 그대로 읽습니다.
+리더 프로세스가 죽으면 운영체제가 잠금을 풀어 주므로 다른 워커가 LEADER_POLL_SECONDS 안에 리더를 이어받습니다.
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import Callable
+from config import settings
+from services.metrics import LEADER
+
+try:
+    import fcntl
+except ImportError:
+    # fcntl이 없는 환경(Windows)은 워커마다 리더로 동작 (기존 동작)
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+class LeaderElection:
+    def __init__(self, path: str, poll_seconds: float = 5.0, enabled: bool = True):
+        self.path = path
+        self.poll_seconds = poll_seconds
+        self.enabled = enabled and fcntl is not None
+        self.is_leader = False
+        self.elected_at: float | None = None
+        self._file = None
+        self._task: asyncio.Task | None = None
+        LEADER.set(0)
+
+    def try_acquire(self) -> bool:
+        """잠금을 잡으면 리더가 됩니다. (이미 리더이면 True)"""
+        if self.is_leader:
+            return True
+        if not self.enabled:
+            self._become_leader()
+            return True
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        f = open(self.path, "a+")
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return False
+
+        # 다른 워커가 현재 리더를 확인할 수 있도록 pid를 기록
+        f.seek(0)
+        f.truncate()
+        f.write(f"{os.getpid()} {socket.gethostname()} {time.time():.0f}\n")
+        f.flush()
+        self._file = f
+        self._become_leader()
+        return True
+
+    def _become_leader(self) -> None:
+        self.is_leader = True
+        self.elected_at = time.time()
+        LEADER.set(1)
+        logger.info(f"[leader] pid {os.getpid()} 워커가 리더로 선출되었습니다.")
+
+    def release(self) -> None:
+        if self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        if self.is_leader:
+            logger.info(f"[leader] pid {os.getpid()} 워커가 리더에서 물러났습니다.")
+        self.is_leader = False
+        self.elected_at = None
+        LEADER.set(0)
+
+    def start(self, on_elected: Callable[[], None]) -> None:
+        """
+        리더가 될 때까지 잠금을 주기적으로 시도하고, 리더가 되면 on_elected를 한 번 호출합니다.
+        (이벤트 루프 안에서 호출)
+        """
+        if self.try_acquire():
+            on_elected()
+            return
+        logger.info(f"[leader] pid {os.getpid()} 워커는 팔로워로 시작합니다. (리더: {self.current_leader()})")
+        self._task = asyncio.create_task(self._wait_for_leadership(on_elected))
+
+    async def _wait_for_leadership(self, on_elected: Callable[[], None]) -> None:
+        while not self.try_acquire():
+            await asyncio.sleep(self.poll_seconds)
+        on_elected()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.release()
+
+    def current_leader(self) -> str | None:
+        """잠금 파일에 기록된 리더 정보 ("pid hostname 선출시각")"""
+        try:
+            with open(self.path) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def get_status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "pid": os.getpid(),
+            "is_leader": self.is_leader,
+            "elected_at": self.elected_at,
+            "leader": self.current_leader() if self.enabled else None,
+        }
+
+# 결과를 공유할 수 없는 메모리 제품 캐시에서는 워커마다 크롤링해야 하므로 선출하지 않음
+leader = LeaderElection(
+    settings.LEADER_LOCK_PATH,
+    poll_seconds=settings.LEADER_POLL_SECONDS,
+    enabled=settings.LEADER_ELECTION and settings.PRODUCT_CACHE_BACKEND == "sqlite",
+)
@@ -0,0 +1,193 @@
+"""
+Prometheus 텍스트 형식(0.0.4)으로 내보내는 간단한 메트릭 모음
+
+외부 라이브러리 없이 Counter / Gauge / Histogram만 구현했습니다.
+요청 단위 단계별 시간은 stage_timer로 기록하며, 같은 값이 히스토그램과 Server-Timing 헤더에 함께 반영됩니다.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_registry: list["_Metric"] = []
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self):
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def _samples(self):
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label 값 -> (버킷별 누적 전 개수, 합계)
+        self._values: dict[tuple[str, ...], tuple[list[int], float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    def _samples(self):
+        for key, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}"
+
+def render_metrics() -> str:
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+# HTTP
+HTTP_REQUESTS = Counter("http_requests_total", "처리한 HTTP 요청 수", ("method", "route", "status"))
+HTTP_LATENCY = Histogram("http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "route"))
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "처리 중인 HTTP 요청 수")
+
+# 진단 단계별 시간 (upload / cache / preprocess / gemini / chart / recommend / products)
+STAGE_LATENCY = Histogram("diagnosis_stage_duration_seconds", "진단 요청 단계별 처리 시간", ("stage",))
+
+# Gemini
+GEMINI_IN_FLIGHT = Gauge("gemini_requests_in_flight", "실행 중인 Gemini 호출 수")
+GEMINI_QUEUED = Gauge("gemini_requests_queued", "실행 중 + 대기 중인 Gemini 호출 수")
+GEMINI_TOKENS = Counter("gemini_tokens_total", "Gemini 사용 토큰 수", ("type",))
+
+# 진단 요청 허용 제어 (lane: analysis / jobs / light, result: admitted / rate_limited / overloaded, 클라이언트별 수치는 GET /skin/admission/stats)
+ADMISSION_REQUESTS = Counter("admission_requests_total", "허용 제어 결과별 요청 수", ("lane", "result"))
+ADMISSION_IN_FLIGHT = Gauge("admission_in_flight", "허용되어 처리 중인 진단 요청 수")
+ADMISSION_QUEUED = Gauge("admission_queued", "동시 분석 자리를 기다리는 진단 요청 수")
+ADMISSION_WAIT = Histogram("admission_queue_wait_seconds", "동시 분석 자리를 기다린 시간")
+
+# 피부 사진 사전 판별 (result: pass / blank / too_dark / too_bright / no_skin_tone / graphic)
+PRESCREEN_RESULTS = Counter("prescreen_results_total", "피부 사진 사전 판별 결과 수", ("result",))
+GEMINI_CALLS_AVOIDED = Counter("gemini_calls_avoided_total", "사전 판별로 건너뛴 Gemini 호출 수", ("reason",))
+
+# 캐시 (cache: analysis_results / products, result: hit / stale / miss)
+CACHE_REQUESTS = Counter("cache_requests_total", "캐시 조회 수", ("cache", "result"))
+
+# 크롤링
+CRAWL_DURATION = Histogram(
+    "crawl_duration_seconds", "성분 1개 크롤링 시간", buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 180.0, 600.0)
+)
+CRAWL_RESULTS = Counter("crawl_results_total", "성분 크롤링 결과 수", ("result",))
+CRAWL_CONCURRENCY_LIMIT = Gauge("crawl_concurrency_limit", "적응형 동시 크롤링 수 (AIMD)")
+CRAWL_IN_FLIGHT = Gauge("crawl_in_flight", "실행 중인 크롤링 수")
+
+# 리더 선출 (크롤링/스케줄러를 실행하는 워커)
+LEADER = Gauge("crawl_leader", "이 워커가 크롤링/스케줄러를 실행하는 리더이면 1")
+
+# 비동기 진단 작업
+JOB_QUEUE_DEPTH = Gauge("diagnosis_jobs_queued", "대기 중인 진단 작업 수")
+JOB_RUNNING = Gauge("diagnosis_jobs_running", "실행 중인 진단 작업 수")
+JOB_WAIT = Histogram("diagnosis_job_wait_seconds", "진단 작업이 대기열에서 기다린 시간")
+
+# 서버 시작 (phase: app_imported / ready / first_200 / warmup_done, 프로세스 시작 기준 초)
+STARTUP_SECONDS = Gauge("startup_phase_seconds", "프로세스 시작부터 각 시작 단계까지 걸린 시간", ("phase",))
+
+# 현재 요청의 단계별 시간 [(stage, seconds)] (미들웨어가 요청마다 새 리스트를 넣음)
+_request_timings: ContextVar[list | None] = ContextVar("request_timings", default=None)
+
+def start_request_timings() -> list:
+    timings = []
+    _request_timings.set(timings)
+    return timings
+
+def record_stage(stage: str, seconds: float) -> None:
+    STAGE_LATENCY.observe(seconds, stage=stage)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((stage, seconds))
+
+@contextmanager
+def stage_timer(stage: str):
+    """with 블록 실행 시간을 단계 시간으로 기록합니다."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started)
+
+def format_server_timing(timings: list) -> str:
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings)
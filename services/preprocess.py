@@ -0,0 +1,188 @@
+import io
+import logging
+import time
+from dataclasses import dataclass
+from fastapi import UploadFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from config import settings
+from services.prescreen import PrescreenResult, prescreen_image
+
+logger = logging.getLogger(__name__)
+
+# 업로드 스트림을 나눠 읽는 단위
+CHUNK_SIZE = 64 * 1024
+# 요청 본문 제한에 더하는 multipart 경계/폼 필드 여유분
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp", "PNG": "image/png"}
+
+class ImageTooLargeError(Exception):
+    """업로드 파일이 허용 크기를 넘었을 때 발생합니다."""
+
+class InvalidImageError(Exception):
+    """업로드 파일을 이미지로 읽을 수 없을 때 발생합니다."""
+
+@dataclass
+class PreprocessedImage:
+    data: bytes
+    mime_type: str
+    width: int
+    height: int
+    original_bytes: int
+    elapsed_ms: float
+    # 피부 사진 사전 판별 결과 (PRESCREEN_ENABLED일 때만)
+    prescreen: PrescreenResult | None = None
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_bytes - len(self.data)
+
+async def read_upload(image: UploadFile, max_bytes: int | None = None) -> bytes:
+    """
+    폼 파싱이 끝난(임시 파일에 저장된) 업로드 파일을 조금씩 읽으면서 크기 제한을 넘으면 메모리로 복사하는 것을 중단합니다.
+    업로드 수신 자체는 UploadLimitMiddleware가 요청 본문 크기로 제한합니다.
+    """
+    max_bytes = max_bytes or settings.UPLOAD_MAX_BYTES
+    buf = bytearray()
+    while True:
+        chunk = await image.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        buf.extend(chunk)
+        if len(buf) > max_bytes:
+            raise ImageTooLargeError(f"이미지 크기는 {max_bytes // (1024 * 1024)}MB 이하만 가능합니다.")
+    return bytes(buf)
+
+class _BodyTooLarge(HTTPException):
+    """폼 파싱 중 발생하면 FastAPI가 400으로 바꾸지 않고 그대로 413으로 응답하도록 HTTPException을 상속"""
+
+class UploadLimitMiddleware:
+    """
+    폼을 파싱하기 전에 요청 본문 크기를 제한하는 ASGI 미들웨어
+    (UploadFile은 라우트가 실행되기 전에 본문 전체를 임시 파일로 받아 두므로 read_upload만으로는 수신을 막지 못함)
+    - Content-Length가 max_bytes를 넘으면 본문을 읽지 않고 바로 413
+    - Content-Length 없이(chunked) 보내면 받은 만큼 세다가 넘는 순간 수신을 중단하고 413
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    def _detail(self) -> str:
+        return f"요청 크기는 {self.max_bytes // (1024 * 1024)}MB 이하만 가능합니다."
+
+    def _reject(self) -> JSONResponse:
+        return JSONResponse({"detail": self._detail()}, status_code=413)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            await self._reject()(scope, receive, send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise _BodyTooLarge(status_code=413, detail=self._detail())
+            return message
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except _BodyTooLarge:
+            if response_started:
+                raise
+            await self._reject()(scope, receive, send)
+
+def open_image(raw: bytes) -> Image.Image:
+    """
+    헤더만 읽어 이미지 형식과 해상도를 확인합니다. (디코딩 전이라 저렴하므로 이벤트 루프에서 호출해도 됨)
+    이미지가 아니면 InvalidImageError, 해상도가 IMAGE_MAX_PIXELS를 넘으면 ImageTooLargeError
+    """
+    try:
+        img = Image.open(io.BytesIO(raw))
+    except Image.DecompressionBombError:
+        # Pillow 자체 제한(MAX_IMAGE_PIXELS의 2배)을 넘는 해상도는 헤더 단계에서 거부됨
+        raise ImageTooLargeError("이미지 해상도가 너무 큽니다.") from None
+    except (UnidentifiedImageError, OSError):
+        raise InvalidImageError("이미지 파일이 아닙니다.") from None
+
+    if img.width * img.height > settings.IMAGE_MAX_PIXELS:
+        raise ImageTooLargeError("이미지 해상도가 너무 큽니다.")
+    return img
+
+def preprocess_image(raw: bytes) -> PreprocessedImage:
+    """
+    Gemini 업로드 전에 이미지를 정리합니다.
+    EXIF 회전 적용 -> 긴 변 기준 축소 -> JPEG/WebP 재인코딩 순서로 처리하며, CPU 작업이므로 스레드에서 호출하세요.
+    """
+    started = time.perf_counter()
+    max_edge = settings.IMAGE_MAX_EDGE
+
+    # 이미지가 아니거나 너무 큰 파일은 디코딩 전에 저렴하게 걸러냄
+    img = open_image(raw)
+    source_mime = Image.MIME.get(img.format)
+
+    try:
+        orientation = img.getexif().get(0x0112, 1)
+        needs_resize = max(img.size) > max_edge
+        # JPEG은 디코딩 단계에서 바로 축소 (전체 해상도 디코딩 비용 절약)
+        img.draft("RGB", (max_edge, max_edge))
+        img = ImageOps.exif_transpose(img)
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        if max(img.size) > max_edge:
+            img.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+    except Image.DecompressionBombError:
+        raise ImageTooLargeError("이미지 해상도가 너무 큽니다.") from None
+    except (OSError, ValueError):
+        raise InvalidImageError("손상된 이미지 파일입니다.") from None
+
+    prescreen = None
+    if settings.PRESCREEN_ENABLED:
+        # 재인코딩 전에 디코딩된 이미지로 피부 사진 여부를 간단히 판별
+        prescreen = prescreen_image(img)
+
+    out = io.BytesIO()
+    img.save(out, format=settings.IMAGE_FORMAT, quality=settings.IMAGE_QUALITY)
+    data = out.getvalue()
+    mime_type = MIME_TYPES[settings.IMAGE_FORMAT]
+
+    # 회전/축소가 필요 없고 원본이 더 작으면 원본을 그대로 사용
+    if orientation == 1 and not needs_resize and len(raw) <= len(data) and source_mime in MIME_TYPES.values():
+        data = raw
+        mime_type = source_mime
+
+    result = PreprocessedImage(
+        data=data,
+        mime_type=mime_type,
+        width=img.width,
+        height=img.height,
+        original_bytes=len(raw),
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+        prescreen=prescreen,
+    )
+    logger.info(
+        f"이미지 전처리: {result.original_bytes} -> {len(result.data)} bytes "
+        f"({result.bytes_saved} bytes 절약, {result.width}x{result.height}, {result.elapsed_ms:.1f}ms)"
+    )
+    return result
@@ -0,0 +1,101 @@
+"""
+피부 사진 사전 판별 (Gemini 호출 전)
+
+축소한 업로드 이미지에 NumPy로 간단한 지표를 계산해 '확실히 피부 사진이 아닌' 경우만 걸러냅니다.
+(빈 화면, 너무 어둡거나 밝은 사진, 피부색이 거의 없는 사진, 스크린샷/그래픽)
+애매한 사진은 모두 통과시키고 판단은 Gemini에 맡기므로 기준값은 보수적으로 잡습니다.
+"""
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from PIL import Image
+from config import settings
+from services.metrics import GEMINI_CALLS_AVOIDED, PRESCREEN_RESULTS
+
+# YCbCr 피부색 범위 (Chai & Ngan, 1999)
+SKIN_CB_RANGE = (77, 127)
+SKIN_CR_RANGE = (133, 173)
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+@dataclass
+class PrescreenResult:
+    reason: str | None = None
+    metrics: dict = field(default_factory=dict)
+
+    @property
+    def rejected(self) -> bool:
+        return self.reason is not None
+
+def compute_metrics(img: Image.Image) -> dict:
+    """PRESCREEN_SIZE로 축소한 사본에서 판별 지표를 계산합니다. (img는 RGB)"""
+    # numpy는 처음 판별할 때 불러옴 (서버 시작 시간 단축)
+    import numpy as np
+
+    small = img.copy()
+    small.thumbnail((settings.PRESCREEN_SIZE, settings.PRESCREEN_SIZE), Image.Resampling.BILINEAR)
+    ycbcr = np.asarray(small.convert("YCbCr"), dtype=np.float32)
+    y, cb, cr = ycbcr[..., 0], ycbcr[..., 1], ycbcr[..., 2]
+
+    skin = (cb >= SKIN_CB_RANGE[0]) & (cb <= SKIN_CB_RANGE[1]) & (cr >= SKIN_CR_RANGE[0]) & (cr <= SKIN_CR_RANGE[1])
+    # 가운데 영역(가로/세로 절반)의 피부색 비율: 얼굴/피부 근접 사진은 가운데가 피부로 채워짐
+    h, w = skin.shape
+    center = skin[h // 4:h - h // 4, w // 4:w - w // 4]
+
+    # 라플라시안 분산 (초점/질감 정도), 이웃 픽셀과 밝기가 같은 비율 (단색 영역이 넓은 스크린샷/그래픽)
+    laplacian = y[1:-1, :-2] + y[1:-1, 2:] + y[:-2, 1:-1] + y[2:, 1:-1] - 4 * y[1:-1, 1:-1]
+    flat = (np.abs(np.diff(y, axis=1))[:-1, :] < 1) & (np.abs(np.diff(y, axis=0))[:, :-1] < 1)
+
+    return {
+        "skin_ratio": float(skin.mean()),
+        "center_skin_ratio": float(center.mean()) if center.size else float(skin.mean()),
+        "brightness": float(y.mean()),
+        "contrast": float(y.std()),
+        "sharpness": float(laplacian.var()) if laplacian.size else 0.0,
+        "flat_ratio": float(flat.mean()) if flat.size else 1.0,
+    }
+
+def classify(metrics: dict) -> str | None:
+    """확실히 피부 사진이 아니면 이유를, 아니면 None을 반환합니다."""
+    if metrics["contrast"] < settings.PRESCREEN_MIN_CONTRAST or metrics["sharpness"] < settings.PRESCREEN_MIN_SHARPNESS:
+        return "blank"
+    if metrics["brightness"] < settings.PRESCREEN_MIN_BRIGHTNESS:
+        return "too_dark"
+    if metrics["brightness"] > settings.PRESCREEN_MAX_BRIGHTNESS:
+        return "too_bright"
+    if metrics["skin_ratio"] < settings.PRESCREEN_MIN_SKIN_RATIO and metrics["center_skin_ratio"] < settings.PRESCREEN_MIN_SKIN_RATIO * 2:
+        return "no_skin_tone"
+    # 배경이 단색이어도 가운데에 피부가 있으면 통과
+    if metrics["flat_ratio"] > settings.PRESCREEN_MAX_FLAT_RATIO and metrics["center_skin_ratio"] < 0.3:
+        return "graphic"
+    return None
+
+def prescreen_image(img: Image.Image) -> PrescreenResult:
+    metrics = compute_metrics(img)
+    result = PrescreenResult(reason=classify(metrics), metrics={k: round(v, 4) for k, v in metrics.items()})
+    outcome = result.reason or "pass"
+    PRESCREEN_RESULTS.inc(result=outcome)
+    with _stats_lock:
+        _stats[outcome] += 1
+    return result
+
+def record_avoided_call(reason: str) -> None:
+    """사전 판별로 Gemini 호출을 건너뛴 횟수 (같은 사진이 동시에 들어와 병합된 경우는 한 번)"""
+    GEMINI_CALLS_AVOIDED.inc(reason=reason)
+    with _stats_lock:
+        _stats["gemini_calls_avoided"] += 1
+
+def get_prescreen_stats() -> dict:
+    with _stats_lock:
+        stats = dict(_stats)
+    checked = sum(v for k, v in stats.items() if k != "gemini_calls_avoided")
+    rejected = checked - stats.get("pass", 0)
+    return {
+        "enabled": settings.PRESCREEN_ENABLED,
+        "checked": checked,
+        "rejected": rejected,
+        "reject_ratio": round(rejected / checked, 4) if checked else 0.0,
+        "gemini_calls_avoided": stats.get("gemini_calls_avoided", 0),
+        "reasons": {k: v for k, v in stats.items() if k not in ("pass", "gemini_calls_avoided")},
+    }
@@ -0,0 +1,157 @@
+"""
+올리브영 검색 결과에서 제품 카드(.prd_info)를 추출하는 파서
+
+- EXTRACT_PRODUCTS_JS: 브라우저 안에서 한 번의 evaluate로 상위 N개 카드의 원본 값을 JSON으로 수집
+- parse_products_html: 저장된 HTML 스냅샷에서 같은 값을 수집 (표준 라이브러리 html.parser 사용, 브라우저 불필요)
+
+두 경로 모두 normalize_product로 URL 보정/기본값 처리를 하므로 결과 형식이 같습니다.
+"""
+from html.parser import HTMLParser
+
+OLIVEYOUNG_BASE_URL = "https://www.oliveyoung.co.kr"
+
+# 카드마다 원본 값만 모아 반환 (보정은 파이썬에서 처리)
+EXTRACT_PRODUCTS_JS = """
+(limit) => Array.from(document.querySelectorAll('.prd_info')).slice(0, limit).map((card) => {
+    const brand = card.querySelector('.tx_brand');
+    const name = card.querySelector('.tx_name');
+    const img = card.querySelector('.prd_thumb > img');
+    const link = card.querySelector('a.prd_thumb');
+    return {
+        brand: brand ? brand.textContent : null,
+        name: name ? name.textContent : null,
+        src: img ? img.getAttribute('src') : null,
+        data_original: img ? img.getAttribute('data-original') : null,
+        href: link ? link.getAttribute('href') : null,
+    };
+})
+"""
+
+def normalize_product(raw: dict, base_url: str = OLIVEYOUNG_BASE_URL) -> dict:
+    """카드 원본 값을 API 응답용 제품 정보(brand, name, image, link)로 변환합니다."""
+    brand = (raw.get("brand") if raw.get("brand") is not None else "브랜드 없음").strip()
+    name = (raw.get("name") if raw.get("name") is not None else "제품명 없음").strip()
+
+    # 리소스 차단으로 src가 로딩 이미지일 수 있으므로 data-original(지연 로딩 원본)을 우선 확인
+    src = raw.get("src")
+    raw_src = src if src and not src.endswith("loading.png") else (raw.get("data_original") or src)
+    image = ""
+    if raw_src:
+        image = f"https:{raw_src}" if raw_src.startswith("//") else raw_src
+
+    href = raw.get("href")
+    link = ""
+    if href and not href.startswith("javascript"):
+        link = href if href.startswith("http") else f"{base_url}{href}"
+
+    return {"brand": brand, "name": name, "image": image, "link": link}
+
+# 종료 태그가 없는 HTML 요소
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+
+class _Node:
+    __slots__ = ("tag", "attrs", "classes", "parent", "children")
+
+    def __init__(self, tag: str, attrs: dict, parent: "_Node | None"):
+        self.tag = tag
+        self.attrs = attrs
+        self.classes = set((attrs.get("class") or "").split())
+        self.parent = parent
+        # 자식 노드 또는 텍스트(str)
+        self.children: list = []
+
+    def text_content(self) -> str:
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                parts.append(node)
+            else:
+                stack.extend(reversed(node.children))
+        return "".join(parts)
+
+    def iter_descendants(self):
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            if isinstance(node, _Node):
+                yield node
+                stack.extend(reversed(node.children))
+
+    def find(self, predicate) -> "_Node | None":
+        return next((node for node in self.iter_descendants() if predicate(node)), None)
+
+class _ProductCardParser(HTMLParser):
+    """.prd_info 카드 limit개가 닫힐 때까지만 트리를 만들고 나머지 문서는 건너뜁니다."""
+
+    def __init__(self, limit: int):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.cards: list[_Node] = []
+        # 현재 열려 있는 카드 내부 요소 스택 (카드 밖이면 빈 리스트)
+        self._stack: list[_Node] = []
+
+    @property
+    def done(self) -> bool:
+        return len(self.cards) >= self.limit and not self._stack
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        attrs = dict(attrs)
+        if not self._stack:
+            if "prd_info" not in (attrs.get("class") or "").split():
+                return
+            node = _Node(tag, attrs, None)
+            self.cards.append(node)
+        else:
+            node = _Node(tag, attrs, self._stack[-1])
+            self._stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self._stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if self._stack and self._stack[-1].tag == tag and tag not in VOID_TAGS:
+            self._stack.pop()
+
+    def handle_endtag(self, tag):
+        # 닫히지 않은 태그가 있어도 가장 가까운 같은 태그까지 닫음
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i].tag == tag:
+                del self._stack[i:]
+                return
+
+    def handle_data(self, data):
+        if self._stack:
+            self._stack[-1].children.append(data)
+
+def _card_to_raw(card: _Node) -> dict:
+    """EXTRACT_PRODUCTS_JS와 같은 선택자로 카드 원본 값을 수집합니다."""
+    brand = card.find(lambda n: "tx_brand" in n.classes)
+    name = card.find(lambda n: "tx_name" in n.classes)
+    img = card.find(lambda n: n.tag == "img" and n.parent is not None and "prd_thumb" in n.parent.classes)
+    link = card.find(lambda n: n.tag == "a" and "prd_thumb" in n.classes)
+    return {
+        "brand": brand.text_content() if brand else None,
+        "name": name.text_content() if name else None,
+        "src": img.attrs.get("src") if img else None,
+        "data_original": img.attrs.get("data-original") if img else None,
+        "href": link.attrs.get("href") if link else None,
+    }
+
+def parse_products_html(html: str, limit: int = 3) -> list[dict]:
+    """저장된 검색 결과 HTML에서 상위 limit개 제품 정보를 추출합니다."""
+    parser = _ProductCardParser(limit)
+    # 필요한 카드를 모두 찾으면 나머지 문서는 파싱하지 않도록 나눠서 입력
+    chunk_size = 16 * 1024
+    for start in range(0, len(html), chunk_size):
+        parser.feed(html[start:start + chunk_size])
+        if parser.done:
+            break
+    parser.close()
+    return [normalize_product(_card_to_raw(card)) for card in parser.cards[:limit]]
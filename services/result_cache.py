@@ -0,0 +1,81 @@
+import hashlib
+from config import settings
+from schemas import AnalysisResponse, GeminiAnalysisResult
+from services.analysis import MODEL_NAME, PROMPT_VERSION
+from services.cache import create_cache
+from services.metrics import CACHE_REQUESTS
+
+# 같은 사진을 다시 올렸을 때 Gemini 호출과 차트 생성을 건너뛰기 위한 결과 캐시
+_cache = create_cache(
+    settings.RESULT_CACHE_BACKEND,
+    table="analysis_results",
+    path=settings.CACHE_DB_PATH,
+    max_entries=settings.RESULT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS,
+)
+
+_stats = {"hits": 0, "misses": 0}
+
+def normalize_concern(concern: str | None) -> str:
+    """공백/대소문자 차이로 캐시 키가 달라지지 않도록 사용자 코멘트를 정규화합니다."""
+    if not concern:
+        return ""
+    return " ".join(concern.split()).lower()
+
+def make_cache_key(image_bytes: bytes, concern: str | None) -> str:
+    """이미지 바이트 해시 + 정규화된 코멘트 + 모델/프롬프트 버전으로 캐시 키를 만듭니다."""
+    hasher = hashlib.sha256()
+    hasher.update(image_bytes)
+    hasher.update(b"\0")
+    hasher.update(normalize_concern(concern).encode("utf-8"))
+    hasher.update(b"\0")
+    hasher.update(f"{MODEL_NAME}:{PROMPT_VERSION}".encode("utf-8"))
+    return hasher.hexdigest()
+
+def make_multi_cache_key(images: list[bytes], regions: list[str], concern: str | None) -> str:
+    """여러 장 진단용 캐시 키 (사진 순서와 부위 이름까지 같아야 같은 키)"""
+    hasher = hashlib.sha256(b"multi\0")
+    for region, image_bytes in zip(regions, images):
+        hasher.update(region.encode("utf-8"))
+        hasher.update(b"\0")
+        hasher.update(hashlib.sha256(image_bytes).digest())
+    hasher.update(normalize_concern(concern).encode("utf-8"))
+    hasher.update(b"\0")
+    hasher.update(f"{MODEL_NAME}:{PROMPT_VERSION}".encode("utf-8"))
+    return hasher.hexdigest()
+
+def get_cached_result(
+    key: str, response_model: type[AnalysisResponse] = AnalysisResponse
+) -> tuple[GeminiAnalysisResult, AnalysisResponse] | None:
+    entry = _cache.get(key)
+    if entry is None:
+        _stats["misses"] += 1
+        CACHE_REQUESTS.inc(cache="analysis_results", result="miss")
+        return None
+
+    _stats["hits"] += 1
+    CACHE_REQUESTS.inc(cache="analysis_results", result="hit")
+    return (
+        GeminiAnalysisResult.model_validate(entry["result"]),
+        response_model.model_validate(entry["response"]),
+    )
+
+def set_cached_result(key: str, result: GeminiAnalysisResult, response: AnalysisResponse) -> None:
+    """
+    분석 결과와 응답(차트 포함)을 저장합니다.
+    추천 성분의 제품 목록은 제품 캐시가 갱신되므로 저장하지 않고, 캐시 적중 때마다 다시 연결합니다.
+    """
+    _cache.set(key, {
+        "result": result.model_dump(mode="json"),
+        "response": response.model_dump(mode="json", exclude={"recommended_ingredients": {"__all__": {"products"}}}),
+    })
+
+def get_result_cache_stats() -> dict:
+    total = _stats["hits"] + _stats["misses"]
+    return {
+        "backend": settings.RESULT_CACHE_BACKEND,
+        "entries": len(_cache),
+        "hits": _stats["hits"],
+        "misses": _stats["misses"],
+        "hit_ratio": round(_stats["hits"] / total, 4) if total else 0.0,
+    }
@@ -0,0 +1,73 @@
+"""
+/skin 라우트 응답 직렬화
+
+- JSON: orjson이 설치되어 있으면 ORJSONResponse, 없으면 기본 JSONResponse
+- multipart/mixed: Accept에 multipart/mixed가 있으면 JSON 본문과 차트 원본(PNG/SVG)을 나눠 보냄
+  base64 인코딩이 없어 차트 크기만큼(약 1/3) 전송량이 줄고 클라이언트도 디코딩할 필요가 없음
+"""
+import base64
+import json
+import uuid
+from fastapi.responses import JSONResponse, Response
+from schemas import AnalysisResponse
+
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as SkinJSONResponse
+except ImportError:
+    orjson = None
+    SkinJSONResponse = JSONResponse
+
+MULTIPART_MEDIA_TYPE = "multipart/mixed"
+
+CHART_MEDIA_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+
+def dumps(content) -> bytes:
+    """JSON 직렬화 (orjson이 없으면 표준 json)"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def wants_multipart(accept: str | None) -> bool:
+    return bool(accept) and MULTIPART_MEDIA_TYPE in accept
+
+def render_multipart(response: AnalysisResponse, boundary: str) -> bytes:
+    """
+    analysis(JSON, graph_image는 null) + graph_image(차트 원본) 두 파트로 나눈 multipart 본문을 만듭니다.
+    차트가 없으면 JSON 파트만 보냅니다.
+    """
+    content = response.model_dump(mode="json")
+    graph_image, content["graph_image"] = content["graph_image"], None
+
+    parts = [(
+        'Content-Type: application/json\r\nContent-Disposition: inline; name="analysis"',
+        dumps(content),
+    )]
+    if graph_image:
+        if response.graph_format == "png":
+            chart = base64.b64decode(graph_image)
+        else:
+            chart = graph_image.encode("utf-8")
+        parts.append((
+            f"Content-Type: {CHART_MEDIA_TYPES[response.graph_format]}\r\n"
+            f'Content-Disposition: inline; name="graph_image"; filename="chart.{response.graph_format}"',
+            chart,
+        ))
+
+    body = bytearray()
+    for headers, data in parts:
+        body += f"--{boundary}\r\n{headers}\r\n\r\n".encode("utf-8")
+        body += data
+        body += b"\r\n"
+    body += f"--{boundary}--\r\n".encode("utf-8")
+    return bytes(body)
+
+class MultipartAnalysisResponse(Response):
+    """AnalysisResponse를 multipart/mixed로 내려주는 응답"""
+
+    def __init__(self, content: AnalysisResponse, **kwargs):
+        self.boundary = uuid.uuid4().hex
+        super().__init__(content, media_type=f'{MULTIPART_MEDIA_TYPE}; boundary="{self.boundary}"', **kwargs)
+
+    def render(self, content: AnalysisResponse) -> bytes:
+        return render_multipart(content, self.boundary)
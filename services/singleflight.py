@@ -0,0 +1,49 @@
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 작업을 한 번만 실행하고, 나머지 호출자는 그 결과를 함께 기다립니다.
+    작업은 별도 태스크로 실행되므로 먼저 호출한 쪽이 취소(클라이언트 연결 끊김 등)되어도 다른 호출자는 결과를 받습니다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._stats = {"calls": 0, "executions": 0, "coalesced": 0}
+        _registry[name] = self
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        self._stats["calls"] += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self._stats["executions"] += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self._stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 기다리던 호출자가 모두 취소된 경우에도 "exception was never retrieved" 경고가 나지 않도록 확인
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self) -> dict:
+        calls = self._stats["calls"]
+        return {
+            **self._stats,
+            "in_flight": len(self._inflight),
+            "coalesced_ratio": round(self._stats["coalesced"] / calls, 4) if calls else 0.0,
+        }
+
+_registry: dict[str, SingleFlight] = {}
+
+def get_singleflight_stats() -> dict:
+    """이름별 중복 호출 병합 통계를 반환합니다."""
+    return {name: flight.get_stats() for name, flight in _registry.items()}
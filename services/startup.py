@@ -0,0 +1,77 @@
+"""
+서버 시작 시간 측정과 무거운 모듈의 지연 로딩
+
+google.genai / matplotlib / numpy / playwright는 불러오는 데만 수백 ms가 걸리므로 main.py에서 바로 import하지 않고
+처음 쓰는 시점(또는 서버 시작 후 백그라운드 예열)에 timed_import로 불러옵니다.
+불러온 시간과 시작 단계별 시각은 GET /startup과 startup_phase_seconds 메트릭으로 확인할 수 있습니다.
+"""
+import asyncio
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+from services.metrics import STARTUP_SECONDS
+
+logger = logging.getLogger(__name__)
+
+_imported_at = time.time()
+_phases: dict[str, float] = {}
+# 모듈 이름 -> {"seconds": 불러온 시간, "thread": 불러온 스레드 이름}
+_lazy_imports: dict[str, dict] = {}
+_lock = threading.Lock()
+
+# 처음으로 / 에 200을 응답하면 set (예열 시작 신호)
+first_response = asyncio.Event()
+
+def _process_started_at() -> float:
+    """프로세스 시작 시각 (리눅스는 /proc 기준, 그 외에는 이 모듈을 불러온 시각)"""
+    try:
+        with open("/proc/self/stat") as f:
+            # comm 필드에 공백이 있을 수 있으므로 마지막 ')' 뒤부터 나눔
+            fields = f.read().rsplit(")", 1)[1].split()
+        start_ticks = int(fields[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return time.time() - uptime + start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return _imported_at
+
+PROCESS_STARTED_AT = _process_started_at()
+
+def mark(phase: str) -> None:
+    """프로세스 시작부터 phase까지 걸린 시간을 기록합니다. (같은 phase는 처음 한 번만)"""
+    with _lock:
+        if phase in _phases:
+            return
+        elapsed = time.time() - PROCESS_STARTED_AT
+        _phases[phase] = elapsed
+    STARTUP_SECONDS.set(round(elapsed, 4), phase=phase)
+    logger.info(f"[startup] {phase}: {elapsed:.3f}s")
+
+def mark_first_response() -> None:
+    if not first_response.is_set():
+        mark("first_200")
+        first_response.set()
+
+def timed_import(name: str):
+    """모듈을 불러오고 처음 불러올 때 걸린 시간을 기록합니다."""
+    # 다른 스레드가 불러오는 중인 모듈(sys.modules에 있지만 초기화 전)은 import_module이 끝날 때까지 기다려 줌
+    loaded = name in sys.modules
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    if loaded:
+        return module
+    elapsed = time.perf_counter() - started
+    with _lock:
+        _lazy_imports.setdefault(name, {"seconds": round(elapsed, 4), "thread": threading.current_thread().name})
+    logger.info(f"[startup] import {name}: {elapsed * 1000:.1f}ms")
+    return module
+
+def get_startup_report() -> dict:
+    return {
+        "process_started_at": PROCESS_STARTED_AT,
+        "phases": {phase: round(seconds, 4) for phase, seconds in _phases.items()},
+        "lazy_imports": dict(_lazy_imports),
+    }